@@ -0,0 +1,73 @@
+# benchmarks/bench_acks.py
+"""Waiting for many ACKs at once: executor-parked threads vs loop futures.
+
+N messages are in flight; a separate "RX" thread acknowledges all of them
+after ``ACK_DELAY``. Meanwhile one unrelated ``run_in_executor`` job (a
+serial write, say) is submitted. The legacy path parks one default-executor
+worker per message in ``threading.Event.wait``, so that job waits for the
+ACKs; with loop futures it runs at once.
+
+Run from the repo root:  python -m benchmarks.bench_acks
+"""
+import asyncio
+import threading
+import time
+
+from meshtui.core.ack_registry import AckRegistry
+
+SIZES = (10, 100, 500)
+ACK_DELAY = 1.0
+
+
+def _rx_thread(ids, resolve) -> threading.Thread:
+    def run():
+        time.sleep(ACK_DELAY)
+        for tx_id in ids:
+            resolve(tx_id)
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    return t
+
+
+async def _other_job() -> float:
+    loop = asyncio.get_running_loop()
+    await asyncio.sleep(0.01)
+    t0 = time.perf_counter()
+    await loop.run_in_executor(None, lambda: None)
+    return time.perf_counter() - t0
+
+
+async def _legacy(n: int):
+    loop = asyncio.get_running_loop()
+    events = {i: threading.Event() for i in range(n)}
+    t0 = time.perf_counter()
+    _rx_thread(range(n), lambda i: events[i].set())
+    waits = [loop.run_in_executor(None, events[i].wait, 20.0) for i in range(n)]
+    stall = await _other_job()
+    await asyncio.gather(*waits)
+    return time.perf_counter() - t0, stall
+
+
+async def _futures(n: int):
+    reg = AckRegistry()
+    for i in range(n):
+        reg.register(i)
+    t0 = time.perf_counter()
+    _rx_thread(range(n), lambda i: reg.set_result(i, "ACK", None))
+    waits = [asyncio.ensure_future(reg.wait(i, 20.0)) for i in range(n)]
+    stall = await _other_job()
+    await asyncio.gather(*waits)
+    return time.perf_counter() - t0, stall
+
+
+def main() -> None:
+    print(f"{'in flight':>10} {'executor: all acks / other job':>32} {'futures: all acks / other job':>31}")
+    for n in SIZES:
+        fut_total, fut_stall = asyncio.run(_futures(n))
+        leg_total, leg_stall = asyncio.run(_legacy(n))
+        print(f"{n:>10} {leg_total:>18.2f} s {leg_stall * 1e3:>8.1f} ms"
+              f" {fut_total:>17.2f} s {fut_stall * 1e3:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
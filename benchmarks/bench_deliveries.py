@@ -0,0 +1,80 @@
+# benchmarks/bench_deliveries.py
+"""Delivery bookkeeping over a long session: unpruned vs timer wheel.
+
+Simulates a session on a fake clock: one message sent every ``SEND_EVERY``
+seconds, most ACKed after a few seconds, the rest never answered. Without
+the tracker every delivery stays in the ack registry and in
+``AppState.msg_by_delivery`` / ``msg_index`` forever; with it, entries are
+expired and evicted, so the count tracks what is in flight plus the
+retention window. Also reports the cost of one wheel advance per tick.
+
+Run from the repo root:  python -m benchmarks.bench_deliveries
+"""
+import heapq
+import random
+import time
+
+from meshtui.core.ack_registry import AckRegistry
+from meshtui.core.delivery import DeliveryTracker
+from meshtui.core.state import AppState
+from meshtui.core.timerwheel import TimerWheel
+
+SESSION_S = 7 * 24 * 3600
+SEND_EVERY = 20.0
+TIMEOUT = 30.0
+RETENTION = 300.0
+ACK_RATE = 0.8
+
+
+def _entries(state: AppState, registry: AckRegistry) -> int:
+    return len(registry) + len(state.msg_by_delivery) + len(state.msg_index)
+
+
+def run(tracked: bool):
+    rng = random.Random(7)
+    state = AppState()
+    registry = AckRegistry()
+    tracker = DeliveryTracker(state, registry, retention=RETENTION, wheel=TimerWheel(now=0.0))
+    acks = []  # (due, tx_id)
+    tick_cost = 0.0
+    ticks = 0
+    tx_id = 0
+    peak = 0
+    now = 0.0
+    next_send = 0.0
+    while now < SESSION_S:
+        if now >= next_send:
+            tx_id += 1
+            msg = state.add_outgoing(5, f"m{tx_id}")
+            state.bind_delivery_id(msg, tx_id)
+            if tracked:
+                tracker.track(tx_id, TIMEOUT, now)
+            if rng.random() < ACK_RATE:
+                heapq.heappush(acks, (now + rng.uniform(1.0, 10.0), tx_id))
+            next_send += SEND_EVERY
+        while acks and acks[0][0] <= now:
+            _due, i = heapq.heappop(acks)
+            registry.set_result(i, "ACK", 5)
+            state.mark_acked(i)
+            if tracked:
+                tracker.settled(i, now)
+        if tracked:
+            t0 = time.perf_counter()
+            tracker.advance(now)
+            tick_cost += time.perf_counter() - t0
+            ticks += 1
+        peak = max(peak, _entries(state, registry))
+        now += 1.0
+    return tx_id, _entries(state, registry), peak, (tick_cost / ticks if ticks else 0.0)
+
+
+def main() -> None:
+    print(f"{'':>10} {'sent':>8} {'entries at end':>15} {'peak':>8} {'advance/tick':>13}")
+    for name, tracked in (("unpruned", False), ("wheel", True)):
+        sent, end, peak, per_tick = run(tracked)
+        cost = f"{per_tick * 1e6:>10.2f} us" if tracked else f"{'-':>13}"
+        print(f"{name:>10} {sent:>8} {end:>15} {peak:>8} {cost}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_map.py
+"""Map rasterization cost with 10k positioned nodes (budget: 16.7 ms for 60 fps).
+
+Each frame forces a full re-rasterize by nudging the viewport, i.e. the
+worst case of a continuous pan; an unchanged map is served from cache.
+Best of five runs, to keep scheduler noise out of the numbers.
+
+Run from the repo root:  python -m benchmarks.bench_map
+"""
+import random
+import timeit
+
+from meshtui.core.state import AppState
+from meshtui.ui_ptk.map import MapControl
+
+N = 10_000
+SIZES = ((80, 24), (160, 48), (240, 70))
+FRAMES = 20
+
+
+def _state(spread_deg: float) -> AppState:
+    rng = random.Random(7)
+    state = AppState()
+    for num in range(N):
+        state.set_position(num, 47.6 + rng.gauss(0, spread_deg), -122.3 + rng.gauss(0, spread_deg))
+    return state
+
+
+def bench(label: str, spread_deg: float) -> None:
+    state = _state(spread_deg)
+    for cols, rows in SIZES:
+        ctl = MapControl(state)
+        ctl.create_content(cols, rows)  # auto-fit once
+        step = iter(range(10 ** 9))
+
+        def pan_frame():
+            ctl.viewport.pan(1 if next(step) % 2 else -1, 0)
+            ctl.create_content(cols, rows)
+
+        per = min(timeit.repeat(pan_frame, number=FRAMES, repeat=5)) / FRAMES
+        cached = min(timeit.repeat(lambda: ctl.create_content(cols, rows), number=FRAMES, repeat=5)) / FRAMES
+        print(f"{label:<10} {cols:>3}x{rows:<3} raster {per * 1e3:6.2f} ms ({1 / per:6.0f} fps)"
+              f"   cached {cached * 1e6:6.1f} us")
+
+
+def main() -> None:
+    bench("city", 0.05)
+    bench("region", 2.0)
+
+
+if __name__ == "__main__":
+    main()
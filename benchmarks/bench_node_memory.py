@@ -0,0 +1,78 @@
+# benchmarks/bench_node_memory.py
+"""Memory and read cost of node storage: legacy nested dicts vs NodeRecord.
+
+Run from the repo root:  python -m benchmarks.bench_node_memory
+"""
+import random
+import time
+import timeit
+import tracemalloc
+
+from meshtui.core.records import GeoPos, NodeMeta, NodeRecord
+
+N = 10_000
+
+
+def _legacy_nodes(rows, full=True):
+    # layout AppState used before NodeRecord: one dict per node plus nested dicts
+    nodes = {}
+    for num, short, last, lat, lon, rx in rows:
+        nodes[num] = {
+            "num": num, "short": short, "last": last, "dm": False,
+            "pos": {"lat": lat, "lon": lon, "alt": None, "ts": last} if full else None,
+            "meta": {"encrypted": False, "channel": 0, "hop": 3, "rx": rx, "last_msg_id": None} if full else {},
+            "snr": None, "hops": None,
+        }
+    return nodes
+
+
+def _record_nodes(rows, full=True):
+    nodes = {}
+    for num, short, last, lat, lon, rx in rows:
+        n = nodes[num] = NodeRecord(num, short, last)
+        if full:
+            n.pos = GeoPos(lat, lon, None, last)
+            n.meta = NodeMeta(False, 0, 3, rx, None)
+    return nodes
+
+
+def _measure(build, rows, full=True):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    nodes = build(rows, full)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    return nodes, size
+
+
+def main() -> None:
+    rng = random.Random(1)
+    now = time.time()
+    # values are created up front so both layouts share them and only the
+    # containers are measured
+    rows = [(num, f"node{num:05d}", now - rng.uniform(0, 86400),
+             rng.uniform(-60, 60), rng.uniform(-180, 180), now) for num in range(N)]
+
+    for full, label in ((False, "beacon only"), (True, "with position + packet meta")):
+        legacy, legacy_bytes = _measure(_legacy_nodes, rows, full)
+        records, record_bytes = _measure(_record_nodes, rows, full)
+        print(f"{N:,} nodes, {label} (containers only, incl. the nodes dict)")
+        print(f"  dict layout    {legacy_bytes / 1e6:7.2f} MB  {legacy_bytes / N:6.0f} B/node")
+        print(f"  NodeRecord     {record_bytes / 1e6:7.2f} MB  {record_bytes / N:6.0f} B/node"
+              f"  ({legacy_bytes / record_bytes:.1f}x smaller)")
+
+    d = legacy[N // 2]
+    r = records[N // 2]
+    loops = 1_000_000
+    t_dict = timeit.timeit(lambda: (d["last"], d["pos"]["lat"]), number=loops)
+    t_attr = timeit.timeit(lambda: (r.last, r.pos.lat), number=loops)
+    t_compat = timeit.timeit(lambda: (r["last"], r["pos"]["lat"]), number=loops)
+    print("read last + pos.lat")
+    print(f"  dict           {t_dict / loops * 1e9:6.1f} ns")
+    print(f"  attribute      {t_attr / loops * 1e9:6.1f} ns")
+    print(f"  mapping compat {t_compat / loops * 1e9:6.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
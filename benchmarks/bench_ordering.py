@@ -0,0 +1,82 @@
+# benchmarks/bench_ordering.py
+"""Cost of keeping the node list ordered: full re-sort vs incremental index.
+
+Each step applies one node update and then reads the first screenful of the
+order, which is what the node list does per frame after a beacon arrives.
+
+Run from the repo root:  python -m benchmarks.bench_ordering
+"""
+import random
+import time
+
+from meshtui.core.ordering import ORDERINGS
+from meshtui.core.state import AppState
+
+SIZES = (1_000, 10_000, 50_000)
+SCREEN = 40
+
+
+def _populate(n: int, rng: random.Random) -> AppState:
+    state = AppState()
+    now = time.time()
+    for num in range(n):
+        state.upsert_node(num, f"node{num:05d}", now - rng.uniform(0, 86400),
+                          snr=rng.uniform(-20, 12), hops=rng.randint(0, 7))
+    return state
+
+
+def _legacy_order(state: AppState) -> list:
+    # pre-index behaviour: a full sort after every node change
+    return sorted(state.nodes.values(), key=lambda n: (-n.get("last", 0), n.get("short", "")))
+
+
+def _updates(n: int, steps: int, rng: random.Random):
+    now = time.time()
+    return [(rng.randrange(n), now + i) for i in range(steps)]
+
+
+def bench(n: int) -> None:
+    rng = random.Random(n)
+    state = _populate(n, rng)
+    steps = max(50, 200_000 // n)
+
+    ups = _updates(n, steps, rng)
+    t0 = time.perf_counter()
+    for num, ts in ups:
+        state.nodes[num]["last"] = ts
+        _legacy_order(state)[:SCREEN]
+    legacy = (time.perf_counter() - t0) / steps
+
+    ups = _updates(n, steps, rng)
+    t0 = time.perf_counter()
+    for num, ts in ups:
+        state.upsert_node(num, "", ts)
+        state.ordered_nodes()[:SCREEN]
+    incremental = (time.perf_counter() - t0) / steps
+
+    t0 = time.perf_counter()
+    for by in ("snr", "hops", "name"):
+        state.ordered_nodes(by)
+    first_build = (time.perf_counter() - t0) / 3
+
+    ups = _updates(n, steps, rng)
+    t0 = time.perf_counter()
+    for num, ts in ups:
+        state.upsert_node(num, "", ts, snr=rng.uniform(-20, 12))
+        state.ordered_nodes("snr")[:SCREEN]
+    all_orders = (time.perf_counter() - t0) / steps
+
+    assert list(state.ordered_nodes("snr")) == sorted(state.nodes.values(), key=ORDERINGS["snr"])
+    print(f"{n:>7,} nodes  re-sort {legacy * 1e6:>9.1f} us/update   "
+          f"index {incremental * 1e6:>6.1f} us/update ({legacy / incremental:>6.0f}x)   "
+          f"4 orders {all_orders * 1e6:>6.1f} us/update   "
+          f"secondary build {first_build * 1e3:>6.1f} ms")
+
+
+def main() -> None:
+    for n in SIZES:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_reducer.py
+"""Per-event cost of reducer dispatch: legacy isinstance chain vs type table.
+
+Run from the repo root:  python -m benchmarks.bench_reducer
+"""
+import time
+import timeit
+
+from meshtui.core import events
+from meshtui.core.events_ext import Position, MsgMeta, Channels, Connection, OwnerInfo, ConnectionFailed
+from meshtui.core.reducer import apply_event
+
+
+class _NullState:
+    """Accepts every reducer call and does nothing, so only dispatch is timed."""
+    last_rx_time = 0.0
+    def upsert_node(self, *a): pass
+    def add_chat(self, *a, **k): pass
+    def add_log(self, *a): pass
+    def set_position(self, *a): pass
+    def set_msg_meta(self, *a): pass
+    def set_channels(self, *a): pass
+
+
+def _legacy_apply_event(state, ev):
+    # Verbatim copy of the pre-dispatch-table reducer, kept for comparison.
+    if isinstance(ev, events.Beacon):
+        state.upsert_node(ev.num, ev.short, ev.ts)
+    elif isinstance(ev, events.RxText):
+        state.last_rx_time = time.time()
+        if ev.dst == 0xFFFFFFFF:
+            state.add_chat(None, ev.text, me=False, sender_id=ev.src)
+        else:
+            state.add_chat(ev.src, ev.text, me=False, sender_id=ev.src)
+    elif isinstance(ev, events.Ack):
+        state.add_log(f"ACK {ev.msg_id}")
+    elif isinstance(ev, events.Log):
+        state.add_log(ev.text)
+    elif isinstance(ev, events.Ports):
+        state.add_log("Ports: " + (", ".join(ev.items) if ev.items else "none"))
+    elif isinstance(ev, Position):
+        state.set_position(ev.num, ev.lat, ev.lon, ev.alt, ev.ts)
+    elif isinstance(ev, MsgMeta):
+        state.set_msg_meta(ev.src, ev.dst, ev.encrypted, ev.channel, ev.hop_limit, ev.rx_time, ev.msg_id)
+    elif isinstance(ev, Channels):
+        state.set_channels(ev.items)
+        state.add_log("Channels: " + (", ".join(f"{i}:{n}" for i, n in ev.items) if ev.items else "none"))
+    elif isinstance(ev, Connection):
+        state.add_log("Connected" if ev.up else "Disconnected")
+    elif isinstance(ev, OwnerInfo):
+        state.add_log(f"Owner: {ev.long} / {ev.short}")
+
+
+SAMPLES = {
+    "Beacon": events.Beacon(num=1, short="n1", ts=0.0),
+    "RxText": events.RxText(src=1, text="hi", dst=0xFFFFFFFF),
+    "Log": events.Log(text="x"),
+    "Position": Position(num=1, lat=1.0, lon=2.0),
+    "OwnerInfo": OwnerInfo(long="a", short="b"),
+    "ConnectionFailed": ConnectionFailed(port="p", error="e"),
+}
+
+
+def main(number: int = 200_000) -> None:
+    state = _NullState()
+    print(f"{'event':<18}{'legacy ns':>12}{'table ns':>12}")
+    for name, ev in SAMPLES.items():
+        legacy = timeit.timeit(lambda: _legacy_apply_event(state, ev), number=number)
+        table = timeit.timeit(lambda: apply_event(state, ev), number=number)
+        print(f"{name:<18}{legacy / number * 1e9:>12.0f}{table / number * 1e9:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+# meshtui/__main__.py
+from meshtui.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,61 @@
+# meshtui/cli.py
+"""``meshtui`` console entry point.
+
+Kept free of prompt_toolkit imports: the TUI modules are only imported when
+the TUI is actually requested, so ``meshtui --headless`` stays lightweight.
+"""
+import argparse
+import asyncio
+import sys
+
+
+def _parse(argv):
+    p = argparse.ArgumentParser(prog="meshtui", description="Terminal UI for Meshtastic radios.")
+    p.add_argument("--headless", action="store_true", help="run without the TUI, logging events as JSON lines")
+    p.add_argument("--port", help="serial port or host[:port] (overrides the saved one)")
+    p.add_argument("--out", default="-", help="headless: output file, '-' for stdout (default)")
+    p.add_argument("--state-interval", type=float, default=30.0,
+                   help="headless: seconds between state summaries, 0 to disable")
+    p.add_argument("--quiet-events", action="store_true", help="headless: only write state summaries")
+    p.add_argument("--simulate", metavar="SCENARIO", nargs="?", const="",
+                   help="use synthetic traffic instead of a radio (optional scenario JSON)")
+    return p.parse_args(argv)
+
+
+def _io_factory(args):
+    if args.simulate is None:
+        return None
+    from meshtui.core.simulator import Scenario, SimulatedIO
+    sc = Scenario.load(args.simulate) if args.simulate else Scenario()
+    return lambda bus, loop, state, cfg: SimulatedIO(bus, loop, state, cfg, sc)
+
+
+def main(argv=None) -> int:
+    args = _parse(sys.argv[1:] if argv is None else argv)
+    if sys.platform.startswith("win"):
+        try:
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())  # type: ignore[attr-defined]
+        except Exception:
+            pass
+    io_factory = _io_factory(args)
+    port = args.port or ("sim://" if io_factory else None)
+    try:
+        if args.headless:
+            from meshtui import daemon
+            out = sys.stdout if args.out == "-" else open(args.out, "a", encoding="utf-8", buffering=1 << 16)
+            try:
+                asyncio.run(daemon.run(port=port, out=out, state_interval=args.state_interval,
+                                       log_events=not args.quiet_events, io_factory=io_factory))
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+        else:
+            from meshtui.main import main as tui_main
+            asyncio.run(tui_main(io_factory=io_factory, port=port))
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
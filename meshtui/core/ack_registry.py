@@ -1,56 +1,120 @@
 # meshtui/core/ack_registry.py
+import asyncio
 import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
+
+TERMINAL = frozenset({"ACK", "NAK"})
 
 
 class AckRegistry:
-    """In-memory tracker for delivery acknowledgements."""
+    """In-memory tracker for delivery acknowledgements.
+
+    ``register`` runs on the event loop and parks an ``asyncio.Future`` for
+    the packet id. ``set_result`` may be called from any thread (the
+    meshtastic RX thread in practice); it records the outcome under the lock
+    and resolves the future with ``call_soon_threadsafe``. Waiting is a
+    coroutine whose timeout is a loop timer, so in-flight messages cost no
+    threads. An outcome that arrives before ``register`` is kept and
+    resolves the future immediately.
+
+    Entries are not pruned here; with :meth:`bind` every outcome is also
+    reported to ``on_settle(tx_id, status)`` on the loop, even one that
+    arrives after the waiter gave up. That lets a
+    :class:`~meshtui.core.delivery.DeliveryTracker` update the chat message
+    and ``forget`` the entry later.
+    """
 
     def __init__(self) -> None:
         self._lock = threading.RLock()
         self._status: Dict[int, Dict[str, Any]] = {}
-        self._waiters: Dict[int, threading.Event] = {}
+        self._waiters: Dict[int, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._on_settle: Optional[Callable[[int, Dict[str, Any]], None]] = None
 
-    def _ensure_waiter(self, tx_id: int) -> threading.Event:
-        event = self._waiters.get(tx_id)
-        if event is None:
-            event = threading.Event()
-            self._waiters[tx_id] = event
-        return event
+    def bind(self, loop: asyncio.AbstractEventLoop,
+             on_settle: Callable[[int, Dict[str, Any]], None]) -> None:
+        self._loop = loop
+        self._on_settle = on_settle
 
-    def register(self, tx_id: int) -> None:
+    def register(self, tx_id: int) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
         with self._lock:
-            self._status[tx_id] = {"state": "PENDING", "from": None, "ts": time.time()}
-            self._ensure_waiter(tx_id)
+            fut = self._waiters.get(tx_id)
+            if fut is None or fut.done():
+                fut = self._waiters[tx_id] = loop.create_future()
+            status = self._status.get(tx_id)
+            if status and status.get("state") in TERMINAL:
+                fut.set_result(dict(status))
+            else:
+                self._status[tx_id] = {"state": "PENDING", "from": None, "ts": time.time()}
+        return fut
 
     def set_result(self, tx_id: int, state: str, from_node: Optional[int]) -> None:
+        status = {"state": state, "from": from_node, "ts": time.time()}
         with self._lock:
-            self._status[tx_id] = {
-                "state": state,
-                "from": from_node,
-                "ts": time.time(),
-            }
-            self._ensure_waiter(tx_id).set()
+            self._status[tx_id] = status
+            fut = self._waiters.get(tx_id)
+        loop = fut.get_loop() if fut is not None else self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._settle, tx_id, fut, dict(status))
+            except RuntimeError:
+                # loop already closed during shutdown
+                pass
+
+    def _settle(self, tx_id: int, fut: Optional[asyncio.Future], status: Dict[str, Any]) -> None:
+        if fut is not None and not fut.done():
+            fut.set_result(status)
+        if self._on_settle is not None:
+            self._on_settle(tx_id, status)
+
+    def expire(self, tx_id: int) -> None:
+        """Give up on ``tx_id`` (loop thread): waiters get ``None``."""
+        with self._lock:
+            entry = self._status.get(tx_id)
+            if entry is None or entry.get("state") not in TERMINAL:
+                self._status[tx_id] = {"state": "TIMEOUT", "from": None, "ts": time.time()}
+            fut = self._waiters.get(tx_id)
+        if fut is not None and not fut.done():
+            fut.set_result(None)
+
+    def forget(self, tx_id: int) -> None:
+        with self._lock:
+            self._status.pop(tx_id, None)
+            fut = self._waiters.pop(tx_id, None)
+        if fut is not None and not fut.done():
+            fut.cancel()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._status)
 
     def get(self, tx_id: int) -> Optional[Dict[str, Any]]:
         with self._lock:
             entry = self._status.get(tx_id)
             return dict(entry) if entry else None
 
-    def wait_for(self, tx_id: int, timeout: float) -> Optional[Dict[str, Any]]:
+    def pending(self) -> int:
         with self._lock:
-            waiter = self._ensure_waiter(tx_id)
-            status = self._status.get(tx_id)
-            if status and status.get("state") in {"ACK", "NAK"}:
-                return dict(status)
-
-        if not waiter.wait(timeout):
-            return None
+            return sum(1 for f in self._waiters.values() if not f.done())
 
+    async def wait(self, tx_id: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """Outcome for ``tx_id`` or ``None`` after ``timeout`` seconds."""
         with self._lock:
-            status = self._status.get(tx_id)
-            return dict(status) if status else None
+            fut = self._waiters.get(tx_id)
+        if fut is None:
+            fut = self.register(tx_id)
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._lock:
+                if self._waiters.get(tx_id) is fut:
+                    del self._waiters[tx_id]
+            if not fut.done():
+                fut.cancel()
 
 
 # Singleton used by transport and meshtastic_io
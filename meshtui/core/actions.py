@@ -1,5 +1,4 @@
 # meshtui/core/actions.py
-import time
 from meshtui.core.events import Log
 
 def send_text(state, iface, bus, text: str):
@@ -7,11 +6,10 @@ def send_text(state, iface, bus, text: str):
     try:
         pkt = iface.sendText(text, destinationId=dest, wantAck=True)
         msg_id = getattr(pkt, "id", None)
-        t = time.strftime("%H:%M:%S")
-        state.log.append(f"[{t}] TX -> {dest or 'BROADCAST'}: {text}")
+        state.add_log(f"TX -> {dest or 'BROADCAST'}: {text}")
         return msg_id
     except Exception as e:
-        state.log.append(f"[ERR] send_text: {e}")
+        state.add_log(f"[ERR] send_text: {e}")
         return None
 
 def send_traceroute(iface, dest_num: int):
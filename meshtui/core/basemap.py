@@ -0,0 +1,316 @@
+# meshtui/core/basemap.py
+"""Offline land/water/coastline basemap in a memory-mapped tile file.
+
+File layout (little endian)::
+
+    header  = b"MTB\\x01" | u8 max_level | u8 reserved | u16 tile_bits (256)
+    index   = for level 0..max_level: 4**level u32 entries, row-major (ty, tx)
+    blobs   = tile_bits**2 / 8 bytes land bitmap + same for coastline
+
+An index entry is ``WATER`` (0) or ``LAND`` (1) for uniform tiles, otherwise
+the file offset of the tile's blob. Bitmaps are stored row by row, bit ``x``
+of a row at byte ``x >> 3``, bit ``x & 7``, so a row reads straight into an
+``int`` with ``int.from_bytes(row, "little")``. Level ``L`` covers the Web
+Mercator world with ``2**L`` x ``2**L`` tiles.
+
+Build a file from a local GeoJSON land dataset (e.g. Natural Earth land
+polygons) with::
+
+    python -m meshtui.core.basemap build land.geojson world.mtb --max-level 5
+"""
+import argparse
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from meshtui.core.geo import project
+
+MAGIC = b"MTB\x01"
+_HEADER = struct.Struct("<4sBBH")
+TILE_BITS = 256
+WATER = 0
+LAND = 1
+MIXED = 2
+
+Ring = List[Tuple[float, float]]
+
+
+class Tile:
+    """Decoded mixed tile: one ``int`` bitset per row for land and coast."""
+    __slots__ = ("land", "coast")
+
+    def __init__(self, land: List[int], coast: List[int]):
+        self.land = land
+        self.coast = coast
+
+
+class Basemap:
+    """Read-only view of a basemap file.
+
+    The file is memory-mapped; nothing is read until a tile is asked for,
+    and only the most recently used ``cache_tiles`` mixed tiles are kept
+    decoded.
+    """
+
+    def __init__(self, path: str, cache_tiles: int = 256):
+        self.path = path
+        self._f = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._f.close()
+            raise
+        try:
+            magic, self.max_level, _reserved, self.tile_bits = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            magic = None
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a meshtui basemap")
+        self._index_at: List[int] = []
+        off = _HEADER.size
+        for level in range(self.max_level + 1):
+            self._index_at.append(off)
+            off += 4 * (4 ** level)
+        if len(self._mm) < off:
+            self.close()
+            raise ValueError(f"{path}: truncated basemap")
+        self._row_bytes = self.tile_bits // 8
+        self._cache: "OrderedDict[Tuple[int, int, int], Tile]" = OrderedDict()
+        self._cache_tiles = max(1, cache_tiles)
+        self.reads = 0
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        finally:
+            self._f.close()
+
+    def entry(self, level: int, tx: int, ty: int) -> int:
+        """Raw index entry: ``WATER``, ``LAND`` or the blob offset of a mixed tile."""
+        n = 1 << level
+        if not (0 <= level <= self.max_level and 0 <= tx < n and 0 <= ty < n):
+            return WATER
+        return struct.unpack_from("<I", self._mm, self._index_at[level] + 4 * (ty * n + tx))[0]
+
+    def kind(self, level: int, tx: int, ty: int) -> int:
+        """``WATER``, ``LAND`` or ``MIXED`` for a tile, without decoding it."""
+        e = self.entry(level, tx, ty)
+        return e if e in (WATER, LAND) else MIXED
+
+    def tile(self, level: int, tx: int, ty: int):
+        """``WATER``, ``LAND`` or a decoded :class:`Tile` for a mixed tile."""
+        n = 1 << level
+        if not (0 <= tx < n and 0 <= ty < n):
+            return WATER
+        key = (level, tx, ty)
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            return hit
+        entry = self.entry(level, tx, ty)
+        if entry in (WATER, LAND):
+            return entry
+        rb, tb = self._row_bytes, self.tile_bits
+        mm = self._mm
+        land_at, coast_at = entry, entry + rb * tb
+        t = Tile(
+            [int.from_bytes(mm[land_at + r * rb:land_at + (r + 1) * rb], "little") for r in range(tb)],
+            [int.from_bytes(mm[coast_at + r * rb:coast_at + (r + 1) * rb], "little") for r in range(tb)],
+        )
+        self.reads += 1
+        self._cache[key] = t
+        if len(self._cache) > self._cache_tiles:
+            self._cache.popitem(last=False)
+        return t
+
+    def sample(self, level: int, bx: int, by: int) -> int:
+        """``WATER``/``LAND`` at bit ``(bx, by)`` of ``level``; MIXED means coast."""
+        tb = self.tile_bits
+        t = self.tile(level, bx // tb, by // tb)
+        if not isinstance(t, Tile):
+            return t
+        r, b = by % tb, bx % tb
+        if (t.coast[r] >> b) & 1:
+            return MIXED
+        return (t.land[r] >> b) & 1
+
+
+# -------- Building ------------------------------------------------------------
+
+def _rings(geojson: dict) -> Iterator[Ring]:
+    """Every polygon ring (outer and holes) in a GeoJSON document."""
+    stack = [geojson]
+    while stack:
+        g = stack.pop()
+        if not isinstance(g, dict):
+            continue
+        t = g.get("type")
+        if t == "FeatureCollection":
+            stack.extend(g.get("features") or [])
+        elif t == "Feature":
+            stack.append(g.get("geometry"))
+        elif t == "GeometryCollection":
+            stack.extend(g.get("geometries") or [])
+        elif t == "Polygon":
+            for ring in g.get("coordinates") or []:
+                yield [(float(p[0]), float(p[1])) for p in ring]
+        elif t == "MultiPolygon":
+            for poly in g.get("coordinates") or []:
+                for ring in poly:
+                    yield [(float(p[0]), float(p[1])) for p in ring]
+
+
+def _edges(rings: Sequence[Ring], size: int) -> List[Tuple[float, float, float, float]]:
+    out = []
+    for ring in rings:
+        pts = []
+        for lon, lat in ring:
+            x, y = project(lat, lon)
+            pts.append((x * size, y * size))
+        for (xa, ya), (xb, yb) in zip(pts, pts[1:] + pts[:1]):
+            out.append((xa, ya, xb, yb))
+    return out
+
+
+def _fill_rows(edges, size: int, y0: int, y1: int) -> List[int]:
+    """Even-odd scanline fill of rows ``y0..y1`` (pixel centers) as int bitsets."""
+    spans = []
+    for xa, ya, xb, yb in edges:
+        if ya == yb:
+            continue
+        if ya > yb:
+            xa, ya, xb, yb = xb, yb, xa, ya
+        if yb <= y0 or ya >= y1 + 1:
+            continue
+        spans.append((ya, yb, xa, (xb - xa) / (yb - ya)))
+    rows = []
+    for y in range(y0, y1):
+        yc = y + 0.5
+        xs = sorted(xa + (yc - ya) * k for ya, yb, xa, k in spans if ya <= yc < yb)
+        bits = 0
+        for a, b in zip(xs[0::2], xs[1::2]):
+            lo = max(0, int(math.ceil(a - 0.5)))
+            hi = min(size, int(math.ceil(b - 0.5)))
+            if hi > lo:
+                bits |= ((1 << (hi - lo)) - 1) << lo
+        rows.append(bits)
+    return rows
+
+
+def _coast_rows(edges, size: int) -> Dict[int, int]:
+    rows: Dict[int, int] = {}
+    for xa, ya, xb, yb in edges:
+        n = int(max(abs(xb - xa), abs(yb - ya))) + 1
+        for i in range(n + 1):
+            t = i / n
+            x = int(xa + (xb - xa) * t)
+            y = int(ya + (yb - ya) * t)
+            if 0 <= x < size and 0 <= y < size:
+                rows[y] = rows.get(y, 0) | (1 << x)
+    return rows
+
+
+def build(rings: Sequence[Ring], path: str, max_level: int = 5, progress=None) -> Dict[str, int]:
+    """Rasterize ``rings`` (lon/lat land polygons) into a basemap file at ``path``."""
+    tb = TILE_BITS
+    rb = tb // 8
+    full = (1 << tb) - 1
+    header_and_index = _HEADER.size + sum(4 * (4 ** lv) for lv in range(max_level + 1))
+    tmp = path + ".tmp"
+    stats = {"mixed": 0, "land": 0, "water": 0}
+    indexes: List[List[int]] = []
+    with open(tmp, "wb") as f:
+        f.write(b"\0" * header_and_index)
+        offset = header_and_index
+        for level in range(max_level + 1):
+            n = 1 << level
+            size = n * tb
+            edges = _edges(rings, size)
+            coast = _coast_rows(edges, size)
+            entries = [WATER] * (n * n)
+            counts = {"mixed": 0, "land": 0, "water": 0}
+            for ty in range(n):
+                land_rows = _fill_rows(edges, size, ty * tb, (ty + 1) * tb)
+                coast_rows = [coast.get(y, 0) for y in range(ty * tb, (ty + 1) * tb)]
+                for tx in range(n):
+                    shift = tx * tb
+                    land_t = [(r >> shift) & full for r in land_rows]
+                    coast_t = [(r >> shift) & full for r in coast_rows]
+                    if not any(coast_t) and all(r == 0 for r in land_t):
+                        counts["water"] += 1
+                        continue
+                    if not any(coast_t) and all(r == full for r in land_t):
+                        entries[ty * n + tx] = LAND
+                        counts["land"] += 1
+                        continue
+                    entries[ty * n + tx] = offset
+                    f.write(b"".join(r.to_bytes(rb, "little") for r in land_t))
+                    f.write(b"".join(r.to_bytes(rb, "little") for r in coast_t))
+                    offset += 2 * rb * tb
+                    counts["mixed"] += 1
+            indexes.append(entries)
+            for kind, c in counts.items():
+                stats[kind] += c
+            if progress:
+                progress(level, counts)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, max_level, 0, tb))
+        for entries in indexes:
+            f.write(struct.pack(f"<{len(entries)}I", *entries))
+    os.replace(tmp, path)
+    stats["bytes"] = offset
+    return stats
+
+
+def load_rings(path: str) -> List[Ring]:
+    with open(path, "r", encoding="utf-8") as f:
+        return list(_rings(json.load(f)))
+
+
+# -------- CLI -----------------------------------------------------------------
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="meshtui-basemap", description="Build or inspect offline basemap tiles.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="rasterize a GeoJSON land dataset")
+    b.add_argument("geojson")
+    b.add_argument("out")
+    b.add_argument("--max-level", type=int, default=5, help="deepest tile level (default 5)")
+    i = sub.add_parser("info", help="summarize a basemap file")
+    i.add_argument("path")
+    args = ap.parse_args(list(argv) if argv is not None else None)
+
+    if args.cmd == "build":
+        rings = load_rings(args.geojson)
+        print(f"{len(rings)} rings from {args.geojson}", flush=True)
+
+        def _progress(level, st):
+            print(f"level {level}: mixed {st['mixed']} land {st['land']} water {st['water']}", flush=True)
+
+        st = build(rings, args.out, max_level=args.max_level, progress=_progress)
+        print(f"wrote {args.out} ({st['bytes'] / 1e6:.1f} MB)")
+        return 0
+
+    bm = Basemap(args.path)
+    try:
+        print(f"{args.path}: levels 0..{bm.max_level}, {bm.tile_bits}px tiles, {os.path.getsize(args.path) / 1e6:.1f} MB")
+        for level in range(bm.max_level + 1):
+            n = 1 << level
+            kinds = [0, 0, 0]
+            for ty in range(n):
+                for tx in range(n):
+                    kinds[bm.kind(level, tx, ty)] += 1
+            print(f"  level {level}: water {kinds[WATER]} land {kinds[LAND]} mixed {kinds[MIXED]}")
+    finally:
+        bm.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
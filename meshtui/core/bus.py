@@ -1,15 +1,397 @@
 # meshtui/core/bus.py
 import asyncio
-from typing import Any, AsyncGenerator
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional, Tuple
 
-class Bus:
-    def __init__(self):
-        self._queue: asyncio.Queue = asyncio.Queue()
+from meshtui.core import events
+from meshtui.core.events_ext import Position, MsgMeta, Channels, Connection, OwnerInfo, ConnectionFailed
+from meshtui.core.ingress import ThreadIngress
+from meshtui.core.metrics import BusMetrics
 
-    async def emit(self, event: Any):
-        await self._queue.put(event)
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_LATENCY = 0.02  # seconds a burst may linger to collect stragglers
+DEFAULT_CAPACITY = 50000    # hard cap per subscriber queue, whatever the policies
+
+# -------- Overflow policies -----------------------------------------------
+
+KEEP = "keep"                # never dropped or merged
+COALESCE = "coalesce"        # only the newest event per key stays queued
+DROP_OLDEST = "drop_oldest"  # at most `limit` queued, oldest evicted first
+
+@dataclass(frozen=True)
+class Policy:
+    mode: str
+    key: Optional[str] = None
+    limit: int = 0
+
+def keep() -> Policy:
+    return Policy(KEEP)
+
+def coalesce(attr: str) -> Policy:
+    return Policy(COALESCE, key=attr)
+
+def drop_oldest(limit: int) -> Policy:
+    return Policy(DROP_OLDEST, limit=max(1, int(limit)))
+
+DEFAULT_POLICIES: Dict[type, Policy] = {
+    events.Beacon: coalesce("num"),
+    Position: coalesce("num"),
+    events.Log: drop_oldest(500),
+    events.Ports: drop_oldest(4),
+    events.RxText: keep(),
+    events.Ack: keep(),
+    MsgMeta: keep(),
+    Channels: keep(),
+    Connection: keep(),
+    OwnerInfo: keep(),
+    ConnectionFailed: keep(),
+}
+
+# -------- Queue -----------------------------------------------------------
+
+_DROPPED = object()
+
+class _Slot:
+    __slots__ = ("ev", "key", "ts", "soft")
+
+    def __init__(self, ev: Any, key: Any = None, soft: bool = False):
+        self.ev = ev
+        self.key = key
+        self.soft = soft  # policy allows dropping it (not KEEP)
+        self.ts = time.perf_counter()  # enqueue time; a coalesced slot keeps the first
+
+
+class EventQueue:
+    """Loop-thread event queue that applies a per-type overflow policy.
+
+    Coalesced events keep the queue position of the first one and carry the
+    newest payload. Evicted events leave a tombstone that is skipped on read;
+    tombstones are compacted away once they outnumber live entries. Types
+    without a policy (and their subclasses) default to KEEP.
+
+    ``capacity`` bounds the live entries regardless of policy: past it the
+    oldest coalesce/drop_oldest entry is dropped, counted in ``dropped`` and
+    ``overflowed``. Only when nothing droppable is queued does the oldest
+    KEEP entry go, counted in ``overflowed_keep`` too, so a stalled consumer
+    cannot grow memory without limit. 0 disables the cap.
+    """
+
+    def __init__(self, policies: Optional[Dict[type, Policy]] = None, capacity: int = DEFAULT_CAPACITY):
+        self._policies: Dict[type, Policy] = dict(DEFAULT_POLICIES if policies is None else policies)
+        self._resolved: Dict[type, Policy] = {}
+        self._q: deque = deque()
+        self._by_key: Dict[Any, _Slot] = {}
+        self._lanes: Dict[type, deque] = {}
+        self._soft: deque = deque()  # droppable slots, in queue order
+        self._live = 0
+        self._dead = 0
+        self.capacity = max(0, int(capacity))
+        self.overflowed = 0
+        self.overflowed_keep = 0
+        self.high_water = 0
+        self._waiter: Optional[asyncio.Future] = None
+        self.coalesced: Counter = Counter()
+        self.dropped: Counter = Counter()
+
+    def set_policy(self, ev_type: type, policy: Policy) -> None:
+        self._policies[ev_type] = policy
+        self._resolved.clear()
+
+    def _policy(self, cls: type) -> Policy:
+        pol = self._resolved.get(cls)
+        if pol is None:
+            pol = next((self._policies[b] for b in cls.__mro__ if b in self._policies), keep())
+            self._resolved[cls] = pol
+        return pol
+
+    def __len__(self) -> int:
+        return self._live
+
+    def put(self, ev: Any) -> None:
+        cls = type(ev)
+        pol = self._policy(cls)
+        if pol.mode == COALESCE:
+            k = getattr(ev, pol.key, None)
+            if k is not None:
+                ck = (cls, k)
+                slot = self._by_key.get(ck)
+                if slot is not None:
+                    slot.ev = ev
+                    self.coalesced[cls.__name__] += 1
+                    return
+                slot = self._by_key[ck] = _Slot(ev, ck, soft=True)
+                self._append(slot)
+                return
+        slot = _Slot(ev, soft=pol.mode != KEEP)
+        if pol.mode == DROP_OLDEST:
+            lane = self._lanes.get(cls)
+            if lane is None:
+                lane = self._lanes[cls] = deque()
+            lane.append(slot)
+            if len(lane) > pol.limit:
+                old = lane.popleft()
+                old.ev = _DROPPED
+                self._live -= 1
+                self._dead += 1
+                self.dropped[cls.__name__] += 1
+        self._append(slot)
+
+    def _append(self, slot: _Slot) -> None:
+        self._q.append(slot)
+        if slot.soft:
+            self._soft.append(slot)
+        self._live += 1
+        if self.capacity and self._live > self.capacity:
+            self._overflow()
+        if self._live > self.high_water:
+            self.high_water = self._live
+        if self._dead > 1024 and self._dead > self._live:
+            self._q = deque(s for s in self._q if s.ev is not _DROPPED)
+            self._dead = 0
+        w = self._waiter
+        if w is not None and not w.done():
+            w.set_result(None)
+
+    def _overflow(self) -> None:
+        soft = self._soft
+        while soft:
+            old = soft.popleft()
+            if old.ev is _DROPPED:
+                continue
+            name = type(old.ev).__name__
+            self._unlink(old)
+            old.ev = _DROPPED
+            self._live -= 1
+            self._dead += 1
+            self.dropped[name] += 1
+            self.overflowed += 1
+            return
+        # only KEEP entries left: losing one is the last resort
+        _ts, ev = self.get_stamped_nowait()
+        self.dropped[type(ev).__name__] += 1
+        self.overflowed += 1
+        self.overflowed_keep += 1
+
+    def _unlink(self, slot: _Slot) -> None:
+        if slot.key is not None:
+            if self._by_key.get(slot.key) is slot:
+                del self._by_key[slot.key]
+        else:
+            lane = self._lanes.get(type(slot.ev))
+            if lane and lane[0] is slot:
+                lane.popleft()
+
+    def get_nowait(self) -> Any:
+        return self.get_stamped_nowait()[1]
+
+    def get_stamped_nowait(self) -> Tuple[float, Any]:
+        """Pop the next live event as ``(enqueue_perf_counter, event)``."""
+        q = self._q
+        while q:
+            slot = q.popleft()
+            ev = slot.ev
+            if ev is _DROPPED:
+                self._dead -= 1
+                continue
+            self._live -= 1
+            self._unlink(slot)
+            if slot.soft:
+                soft = self._soft
+                while soft and soft[0] is not slot:
+                    soft.popleft()
+                if soft:
+                    soft.popleft()
+            return slot.ts, ev
+        raise asyncio.QueueEmpty
+
+    async def wait(self) -> None:
+        while not self._live:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    async def get(self) -> Any:
+        await self.wait()
+        return self.get_nowait()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self._live,
+            "high_water": self.high_water,
+            "coalesced": dict(self.coalesced),
+            "dropped": dict(self.dropped),
+            "overflowed": self.overflowed,
+            "overflowed_keep": self.overflowed_keep,
+        }
+
+# -------- Subscriptions --------------------------------------------------
+
+class Subscription:
+    """One consumer of the bus with its own queue, policies and metrics.
+
+    ``types`` restricts delivery to those event classes (and subclasses);
+    events a subscriber did not ask for are never queued for it, so a slow
+    subscriber only ever backs up its own queue, and that only up to
+    ``capacity`` events.
+    """
+
+    def __init__(self, bus: "Bus", name: str, types: Optional[Iterable[type]] = None,
+                 policies: Optional[Dict[type, Policy]] = None, capacity: int = DEFAULT_CAPACITY):
+        self.bus = bus
+        self.name = name
+        self.types: Optional[Tuple[type, ...]] = tuple(types) if types else None
+        self.queue = EventQueue(policies, capacity)
+        self.metrics = BusMetrics()
+
+    def accepts(self, cls: type) -> bool:
+        return self.types is None or issubclass(cls, self.types)
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.queue.stats()
+
+    def snapshot(self) -> Dict[str, Any]:
+        snap = self.metrics.snapshot()
+        snap.update(self.queue.stats())
+        return snap
 
     async def listen(self) -> AsyncGenerator[Any, None]:
         while True:
-            ev = await self._queue.get()
+            ev = await self.queue.get()
             yield ev
+
+    async def listen_batches(self, max_batch: int = DEFAULT_MAX_BATCH,
+                             max_latency: float = DEFAULT_MAX_LATENCY,
+                             stamped: bool = False) -> AsyncGenerator[List[Any], None]:
+        """Yield lists of queued events instead of single events.
+
+        Waits for one event, then drains whatever else is already queued (up to
+        ``max_batch``). A lone event is yielded immediately; only when a burst is
+        detected does the batch linger up to ``max_latency`` seconds for more.
+        With ``stamped=True`` items are ``(enqueue_perf_counter, event)`` pairs.
+        """
+        max_batch = max(1, int(max_batch))
+        loop = asyncio.get_running_loop()
+        q = self.queue
+        pop = q.get_stamped_nowait if stamped else q.get_nowait
+        while True:
+            await q.wait()
+            batch = [pop()]
+            _drain_into(batch, max_batch, pop)
+            if max_latency > 0 and 1 < len(batch) < max_batch:
+                deadline = loop.time() + max_latency
+                while len(batch) < max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        await asyncio.wait_for(q.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    _drain_into(batch, max_batch, pop)
+            self.metrics.observe_batch()
+            yield batch
+
+
+def _drain_into(batch: List[Any], max_batch: int, pop) -> None:
+    while len(batch) < max_batch:
+        try:
+            batch.append(pop())
+        except asyncio.QueueEmpty:
+            return
+
+# -------- Bus -------------------------------------------------------------
+
+class Bus:
+    """Publish/subscribe hub. Every emitted event is fanned out to the queue
+    of each subscriber that accepts its type.
+
+    The bus always has a primary ``"ui"`` subscription; ``listen``,
+    ``listen_batches``, ``metrics`` and ``stats`` on the bus refer to it.
+    """
+
+    def __init__(self, policies: Optional[Dict[type, Policy]] = None):
+        self._subs: List[Subscription] = []
+        self._routes: Dict[type, Tuple[EventQueue, ...]] = {}
+        self._ingress: Optional[ThreadIngress] = None
+        self.primary = self.subscribe("ui", policies=policies)
+
+    # ---- subscribers ----
+    def subscribe(self, name: str, types: Optional[Iterable[type]] = None,
+                  policies: Optional[Dict[type, Policy]] = None,
+                  capacity: int = DEFAULT_CAPACITY) -> Subscription:
+        sub = Subscription(self, name, types, policies, capacity)
+        self._subs.append(sub)
+        self._routes.clear()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub in self._subs and sub is not self.primary:
+            self._subs.remove(sub)
+            self._routes.clear()
+
+    @property
+    def subscriptions(self) -> List[Subscription]:
+        return list(self._subs)
+
+    def _route(self, cls: type) -> Tuple[EventQueue, ...]:
+        qs = self._routes.get(cls)
+        if qs is None:
+            qs = self._routes[cls] = tuple(s.queue for s in self._subs if s.accepts(cls))
+        return qs
+
+    # ---- producers ----
+    async def emit(self, event: Any):
+        self.emit_nowait(event)
+
+    def emit_nowait(self, event: Any) -> None:
+        for q in self._route(type(event)):
+            q.put(event)
+
+    def emit_many(self, events: Iterable[Any]) -> None:
+        route = self._route
+        for ev in events:
+            for q in route(type(ev)):
+                q.put(ev)
+
+    def ingress(self, loop: asyncio.AbstractEventLoop) -> ThreadIngress:
+        """Shared thread-safe entry point for producers running off the loop."""
+        if self._ingress is None:
+            self._ingress = ThreadIngress(loop, self.emit_many)
+        return self._ingress
+
+    # ---- primary consumer ----
+    @property
+    def metrics(self) -> BusMetrics:
+        return self.primary.metrics
+
+    def stats(self) -> Dict[str, Any]:
+        return self.primary.stats()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Primary queue stats and metrics plus a depth summary per subscriber."""
+        snap = self.primary.snapshot()
+        snap["subscribers"] = {
+            s.name: {
+                "depth": len(s.queue),
+                "high_water": s.queue.high_water,
+                "dropped": sum(s.queue.dropped.values()),
+                "coalesced": sum(s.queue.coalesced.values()),
+            }
+            for s in self._subs
+        }
+        return snap
+
+    def listen(self) -> AsyncGenerator[Any, None]:
+        return self.primary.listen()
+
+    def listen_batches(self, max_batch: int = DEFAULT_MAX_BATCH,
+                       max_latency: float = DEFAULT_MAX_LATENCY,
+                       stamped: bool = False) -> AsyncGenerator[List[Any], None]:
+        return self.primary.listen_batches(max_batch, max_latency, stamped)
@@ -0,0 +1,40 @@
+# meshtui/core/clock.py
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+
+class CoarseClock:
+    """Shared low-resolution wall clock.
+
+    ``now`` is refreshed once per ``period`` by :meth:`run` (or by calling
+    :meth:`tick` directly) and every subscriber is called with the new time.
+    Code that only needs second-level time reads ``clock.now`` instead of
+    calling ``time.time()`` per item, and timers that would otherwise each
+    need their own wake-up hang off the single tick.
+    """
+
+    def __init__(self, period: float = 1.0):
+        self.period = period
+        self.now = time.time()
+        self.ticks = 0
+        self._subs: List[Callable[[float], None]] = []
+
+    def subscribe(self, fn: Callable[[float], None]) -> Callable[[float], None]:
+        self._subs.append(fn)
+        return fn
+
+    def unsubscribe(self, fn: Callable[[float], None]) -> None:
+        if fn in self._subs:
+            self._subs.remove(fn)
+
+    def tick(self, now: Optional[float] = None) -> None:
+        self.now = time.time() if now is None else now
+        self.ticks += 1
+        for fn in list(self._subs):
+            fn(self.now)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.period)
+            self.tick()
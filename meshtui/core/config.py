@@ -1,9 +1,14 @@
 # meshtui/core/config.py
-import os, json
+import os, json, tempfile
 from dataclasses import dataclass, field, asdict
 
 DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".meshtui.json")
 
+# read once at import: os.umask can only be queried by setting it, which is
+# not safe once saves run on executor threads
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
 @dataclass
 class Config:
     theme: str | None = None
@@ -17,6 +22,13 @@ class Config:
     split_left: float = 0.35           # 0..1 width of left column
     split_nodes_log: float = 0.65      # 0..1 height of nodes vs log in left column, i hate you nodes window
     last_tab: str = "Chat"
+    bus_max_batch: int = 256           # events applied per redraw
+    bus_max_latency_ms: int = 20       # how long a burst may linger to batch up
+    journal_path: str | None = None    # binary event journal, off when unset
+    ui_max_fps: int = 30               # redraw cap under load; 0 = uncapped
+    ui_idle_refresh_s: float = 1.0     # coarse clock period; 0 = never redraw for it
+    basemap_path: str | None = None    # offline basemap tiles (meshtui-basemap build)
+    ui_profile: bool = False           # time every view from startup (F7 overlay, F10 dump)
 
     @staticmethod
     def load(path: str = DEFAULT_PATH) -> "Config":
@@ -37,20 +49,64 @@ class Config:
             split_left=float(data.get("split_left", 0.35)),
             split_nodes_log=float(data.get("split_nodes_log", 0.65)),
             last_tab=str(data.get("last_tab", "Chat")),
+            bus_max_batch=int(data.get("bus_max_batch", 256)),
+            bus_max_latency_ms=int(data.get("bus_max_latency_ms", 20)),
+            journal_path=data.get("journal_path"),
+            ui_max_fps=int(data.get("ui_max_fps", 30)),
+            ui_idle_refresh_s=float(data.get("ui_idle_refresh_s", 1.0)),
+            basemap_path=data.get("basemap_path"),
+            ui_profile=bool(data.get("ui_profile", False)),
         )
 
-    def save(self, path: str = DEFAULT_PATH) -> None:
+    def to_dict(self) -> dict:
         data = asdict(self)
         data["active_channels"] = list(self.active_channels)
-        directory = os.path.dirname(path)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        return data
+
+    def save(self, path: str = DEFAULT_PATH) -> None:
+        write_json_atomic(path, self.to_dict())
+
+    def request_save(self, *fields: str) -> None:
+        """Ask for ``fields`` to be persisted.
+
+        With a :class:`~meshtui.core.configstore.ConfigStore` attached the
+        write is debounced and happens off the event loop; without one this
+        is a plain :meth:`save`.
+        """
+        store = getattr(self, "_store", None)
+        if store is not None:
+            store.mark(*fields)
+        else:
+            self.save()
 
     def is_ready(self) -> bool:
         return bool(self.last_port)
 
+def write_json_atomic(path: str, data: dict) -> None:
+    """Write ``data`` as JSON so readers only ever see the old or the new file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".meshtui-", suffix=".tmp", dir=directory or None)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp makes the file 0600; keep the mode the config already had
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
 def apply_to_state(cfg: "Config", state) -> None:
     if getattr(cfg, "active_channels", None):
         state.set_active_channels(cfg.active_channels)
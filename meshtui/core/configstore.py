@@ -0,0 +1,98 @@
+# meshtui/core/configstore.py
+import asyncio
+import time
+from typing import Any, Dict, Optional, Set
+
+from meshtui.core.config import DEFAULT_PATH, Config, write_json_atomic
+
+DEFAULT_DELAY = 1.0      # quiet time before dirty fields are written
+DEFAULT_MAX_DELAY = 10.0  # upper bound on how long a change may stay unwritten
+
+
+class ConfigStore:
+    """Debounced, atomic persistence for a :class:`Config`.
+
+    Callers change fields and call ``cfg.request_save(*fields)``. Fields whose
+    value matches what was last written are ignored; anything else marks the
+    store dirty and (re)arms a timer, so a burst of changes costs one write,
+    issued ``delay`` seconds after the last change but never more than
+    ``max_delay`` after the first. The JSON is built on the loop thread and
+    written in the default executor via temp file + ``os.replace``. At most
+    one write is in flight; changes made meanwhile get a follow-up write.
+    """
+
+    def __init__(self, cfg: Config, path: str = DEFAULT_PATH,
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 delay: float = DEFAULT_DELAY, max_delay: float = DEFAULT_MAX_DELAY):
+        self.cfg = cfg
+        self.path = path
+        self.loop = loop or asyncio.get_event_loop()
+        self.delay = delay
+        self.max_delay = max(delay, max_delay)
+        self.dirty: Set[str] = set()
+        self._saved: Dict[str, Any] = cfg.to_dict()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._first_dirty: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self.writes = 0
+        self.last_error: Optional[BaseException] = None
+        cfg._store = self
+
+    def mark(self, *fields: str) -> None:
+        """Note changed ``fields`` (all fields when none are given)."""
+        current = self.cfg.to_dict()
+        names = fields or tuple(current)
+        for name in names:
+            if name not in current:
+                raise KeyError(name)
+            if current[name] != self._saved.get(name):
+                self.dirty.add(name)
+        if self.dirty:
+            self._arm()
+
+    def _arm(self) -> None:
+        now = time.monotonic()
+        if self._first_dirty is None:
+            self._first_dirty = now
+        due = min(now + self.delay, self._first_dirty + self.max_delay)
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self.loop.call_at(self.loop.time() + max(0.0, due - now), self._fire)
+
+    def _fire(self) -> None:
+        self._timer = None
+        if self._task is None or self._task.done():
+            self._task = self.loop.create_task(self.flush())
+
+    async def flush(self) -> None:
+        """Write now if anything is dirty, waiting for a write already running."""
+        if self._task is not None and not self._task.done() and self._task is not asyncio.current_task():
+            await asyncio.shield(self._task)
+        while self.dirty:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            data = self.cfg.to_dict()
+            self.dirty.clear()
+            self._first_dirty = None
+            try:
+                await self.loop.run_in_executor(None, write_json_atomic, self.path, data)
+            except Exception as e:
+                # keep the unwritten fields dirty and retry later, not in a loop
+                self.last_error = e
+                self.dirty.update(k for k, v in data.items() if v != self._saved.get(k))
+                if self._timer is None:
+                    self._timer = self.loop.call_later(self.max_delay, self._fire)
+                return
+            self._saved = data
+            self.writes += 1
+            self.last_error = None
+
+    async def aclose(self) -> None:
+        """Flush pending changes and detach from the config (shutdown)."""
+        await self.flush()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if getattr(self.cfg, "_store", None) is self:
+            self.cfg._store = None
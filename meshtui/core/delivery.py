@@ -0,0 +1,98 @@
+# meshtui/core/delivery.py
+import asyncio
+import time
+from typing import Callable, Optional
+
+from meshtui.core.timerwheel import TimerWheel
+
+DEFAULT_RETENTION = 300.0  # seconds a settled delivery stays queryable
+GRACE = 5.0                # transport-side timeout slack over the wheel's
+
+
+class DeliveryTracker:
+    """Expiry and eviction for outgoing deliveries on one timer wheel.
+
+    ``track`` arms a pending timeout for a delivery id. When it fires the
+    chat message goes to FAILED and the registry waiter is released. A
+    radio outcome reported by the registry is applied to the chat message
+    whenever it arrives, so a late ACK still turns FAILED into ACKED. Once a
+    delivery is settled (ACK, NAK or expired) it is kept for ``retention``
+    seconds and then dropped from the ack registry and from
+    ``state.msg_by_delivery`` / ``state.msg_index``, so bookkeeping stays
+    proportional to what is in flight. :meth:`attach` starts a loop task
+    that advances the wheel every ``wheel.resolution`` seconds, so expiry
+    runs the same with or without a UI; ``on_change`` (the UI's redraw
+    request) is called when a visible message changed status.
+    """
+
+    def __init__(self, state, registry, retention: float = DEFAULT_RETENTION,
+                 wheel: Optional[TimerWheel] = None):
+        self.state = state
+        self.registry = registry
+        self.retention = retention
+        self.wheel = wheel if wheel is not None else TimerWheel(now=time.time())
+        self.expired = 0
+        self.evicted = 0
+        self.on_change: Optional[Callable[[], None]] = None
+        self._changed = False
+        self._now = time.time()
+        self._task: Optional[asyncio.Task] = None
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Bind registry outcomes (from any thread) to ``loop`` and start ticking there."""
+        self.registry.bind(loop, self._outcome)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    async def aclose(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.wheel.resolution)
+            if self.advance(time.time()) and self.on_change is not None:
+                self.on_change()
+
+    def track(self, tx_id: int, timeout: float, now: Optional[float] = None) -> None:
+        status = self.registry.get(tx_id)
+        if status and status.get("state") != "PENDING":
+            self.settled(tx_id, now)
+            return
+        now = time.time() if now is None else now
+        self.wheel.schedule(tx_id, now + timeout, self._expire)
+
+    def settled(self, tx_id: int, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        self.wheel.schedule(tx_id, now + self.retention, self._evict)
+
+    def _outcome(self, tx_id: int, status: dict) -> None:
+        st = status.get("state")
+        if st == "ACK":
+            self.state.mark_acked(tx_id)
+        elif st == "NAK":
+            self.state.mark_failed(tx_id)
+        self.settled(tx_id)
+        if self.on_change is not None:
+            self.on_change()
+
+    def advance(self, now: float) -> bool:
+        """Run due timers; True when a visible message changed status."""
+        self._changed = False
+        self._now = now
+        self.wheel.advance(now)
+        return self._changed
+
+    def _expire(self, tx_id: int) -> None:
+        self.expired += 1
+        self.registry.expire(tx_id)
+        if self.state.mark_failed(tx_id):
+            self._changed = True
+        self.settled(tx_id, self._now)
+
+    def _evict(self, tx_id: int) -> None:
+        self.evicted += 1
+        self.registry.forget(tx_id)
+        self.state.forget_delivery(tx_id)
@@ -17,6 +17,8 @@ class Beacon:
     num: int
     short: str
     ts: float
+    snr: Optional[float] = None
+    hops: Optional[int] = None
 
 @dataclass(frozen=True)
 class Log:
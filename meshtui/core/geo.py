@@ -0,0 +1,133 @@
+# meshtui/core/geo.py
+"""Web Mercator projection and a grid spatial index over node positions.
+
+World coordinates are the unit square: x grows east from -180°, y grows
+south from the Mercator latitude limit (±85.0511°). The map engine scales
+them by ``2**zoom``; the index buckets them on a fixed grid so a viewport
+query only visits the buckets it overlaps.
+"""
+import math
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+MAX_LAT = 85.05112878
+
+
+def project(lat: float, lon: float) -> Tuple[float, float]:
+    lat = max(-MAX_LAT, min(MAX_LAT, lat))
+    x = min(1.0, max(0.0, (lon + 180.0) / 360.0))
+    s = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)
+    return x, y
+
+
+def unproject(x: float, y: float) -> Tuple[float, float]:
+    lon = x * 360.0 - 180.0
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+    return lat, lon
+
+
+class GridIndex:
+    """Points bucketed on a ``2**level`` square grid over world coordinates.
+
+    ``update`` moves a point between buckets in O(1). ``query`` walks only the
+    buckets overlapping the rectangle, falling back to a plain scan when the
+    rectangle spans more buckets than there are points (zoomed far out).
+    """
+
+    def __init__(self, level: int = 10):
+        self.level = level
+        self._n = 1 << level
+        self._pts: Dict[int, Tuple[float, float]] = {}
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self.version = 0
+        self._bounds: Optional[Tuple[float, float, float, float]] = None
+        self._bounds_ver = -1
+
+    def __len__(self) -> int:
+        return len(self._pts)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        n = self._n
+        return min(n - 1, max(0, int(x * n))), min(n - 1, max(0, int(y * n)))
+
+    def update(self, key: int, x: float, y: float) -> None:
+        old = self._pts.get(key)
+        cell = self._cell(x, y)
+        if old is not None:
+            old_cell = self._cell(*old)
+            if old_cell != cell:
+                self._discard_from(old_cell, key)
+                self._cells.setdefault(cell, set()).add(key)
+        else:
+            self._cells.setdefault(cell, set()).add(key)
+        self._pts[key] = (x, y)
+        self.version += 1
+
+    def update_latlon(self, key: int, lat: float, lon: float) -> None:
+        x, y = project(lat, lon)
+        self.update(key, x, y)
+
+    def remove(self, key: int) -> None:
+        old = self._pts.pop(key, None)
+        if old is not None:
+            self._discard_from(self._cell(*old), key)
+            self.version += 1
+
+    def _discard_from(self, cell: Tuple[int, int], key: int) -> None:
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._cells[cell]
+
+    def get(self, key: int) -> Optional[Tuple[float, float]]:
+        return self._pts.get(key)
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> Iterator[Tuple[int, float, float]]:
+        """Yield ``(key, x, y)`` for points with x0 <= x < x1 and y0 <= y < y1."""
+        pts = self._pts
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > max(len(self._cells), 1):
+            for key, (x, y) in pts.items():
+                if x0 <= x < x1 and y0 <= y < y1:
+                    yield key, x, y
+            return
+        cells = self._cells
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for key in bucket:
+                    x, y = pts[key]
+                    if x0 <= x < x1 and y0 <= y < y1:
+                        yield key, x, y
+
+    def points(self, x0: float, y0: float, x1: float, y1: float) -> List[Tuple[float, float]]:
+        """Like :meth:`query` but only the coordinates, built as one list."""
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > max(len(self._cells), 1):
+            return [p for p in self._pts.values() if x0 <= p[0] < x1 and y0 <= p[1] < y1]
+        pts, cells = self._pts, self._cells
+        out: List[Tuple[float, float]] = []
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    out.extend(p for p in map(pts.__getitem__, bucket)
+                               if x0 <= p[0] < x1 and y0 <= p[1] < y1)
+        return out
+
+    def bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        """``(x0, y0, x1, y1)`` of all points, or None when empty."""
+        if self._bounds_ver != self.version:
+            if self._pts:
+                xs: List[float] = [p[0] for p in self._pts.values()]
+                ys: List[float] = [p[1] for p in self._pts.values()]
+                self._bounds = (min(xs), min(ys), max(xs), max(ys))
+            else:
+                self._bounds = None
+            self._bounds_ver = self.version
+        return self._bounds
@@ -0,0 +1,46 @@
+# meshtui/core/ingress.py
+import asyncio
+from collections import deque
+from typing import Any, Callable, Iterable
+
+
+class ThreadIngress:
+    """Cross-thread event buffer feeding the asyncio loop.
+
+    Producer threads (the meshtastic pubsub thread, paho's network thread)
+    call :meth:`push`, which is a plain ``deque.append``. The loop is only woken
+    when the buffer goes from empty to non-empty; the wakeup then drains
+    everything that piled up in one go into ``sink``.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, sink: Callable[[Iterable[Any]], None]):
+        self._loop = loop
+        self._sink = sink
+        self._buf: deque = deque()
+        self._armed = False
+        self.wakeups = 0
+
+    def push(self, ev: Any) -> None:
+        # deque.append is atomic; the flag is only a hint. A stale read here at
+        # worst schedules one extra (empty) drain, never loses an event, since
+        # _drain clears the flag before it starts popping.
+        self._buf.append(ev)
+        if not self._armed:
+            self._armed = True
+            try:
+                self._loop.call_soon_threadsafe(self._drain)
+            except RuntimeError:
+                # loop already closed during shutdown
+                pass
+
+    def _drain(self) -> None:
+        self._armed = False
+        self.wakeups += 1
+        buf = self._buf
+        if not buf:
+            return
+        items = []
+        pop = buf.popleft
+        while buf:
+            items.append(pop())
+        self._sink(items)
@@ -0,0 +1,298 @@
+# meshtui/core/journal.py
+"""Append-only binary journal of bus events, with mmap-based replay.
+
+File layout::
+
+    b"MTJ\\x02"                         magic / format version
+    repeated:
+      u32 length                        little-endian, size of the body
+      body = f64 wall_ts | u8 tag | JSON array of the dataclass fields
+
+A record cut short by a crash is ignored on replay, and cut off by the
+writer before it appends again. Version 1 files (fields
+as ``marshal`` data, which is only stable within one Python version) are
+still read; the writer moves one aside to ``<path>.v1`` rather than append
+to it.
+"""
+import asyncio
+import json
+import marshal
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import fields
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from meshtui.core import events
+from meshtui.core.bus import drop_oldest
+from meshtui.core.events_ext import Position, MsgMeta, Channels, Connection, OwnerInfo, ConnectionFailed
+
+MAGIC = b"MTJ\x02"
+MAGIC_V1 = b"MTJ\x01"
+_LEN = struct.Struct("<I")
+_HEAD = struct.Struct("<dB")
+
+# Tags are part of the file format: append new types, never renumber.
+TAGS: Dict[int, type] = {
+    1: events.RxText,
+    2: events.Ack,
+    3: events.Beacon,
+    4: events.Log,
+    5: events.Ports,
+    16: Position,
+    17: MsgMeta,
+    18: Channels,
+    19: Connection,
+    20: OwnerInfo,
+    21: ConnectionFailed,
+}
+_TAG_OF: Dict[type, int] = {cls: tag for tag, cls in TAGS.items()}
+_FIELDS: Dict[type, Tuple[str, ...]] = {cls: tuple(f.name for f in fields(cls)) for cls in TAGS.values()}
+# JSON has no tuples; rebuild the ones the reducer expects
+_DECODE: Dict[type, Callable[[list], list]] = {
+    Channels: lambda f: [[tuple(item) for item in f[0]]] + f[1:],
+}
+
+# The journal wants every event, so nothing is coalesced; only a runaway log
+# flood is capped should the writer ever fall that far behind.
+JOURNAL_POLICIES = {events.Log: drop_oldest(10000)}
+
+
+def encode(ev: Any, ts: float) -> Optional[bytes]:
+    cls = type(ev)
+    tag = _TAG_OF.get(cls)
+    if tag is None:
+        return None
+    payload = json.dumps([getattr(ev, name) for name in _FIELDS[cls]], separators=(",", ":")).encode()
+    body = _HEAD.pack(ts, tag) + payload
+    return _LEN.pack(len(body)) + body
+
+
+class JournalWriter:
+    """Collects events on the loop thread and writes them from a background thread.
+
+    ``append`` only pushes onto a deque; encoding and disk I/O happen in the
+    writer thread every ``flush_interval`` seconds, or sooner once
+    ``batch_size`` events are pending. Past ``max_pending`` queued events
+    new ones are counted in ``skipped`` instead. Only the writer thread
+    touches the file; it does the final flush and closes it on the way out.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.5, batch_size: int = 1024,
+                 max_pending: int = 100000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._pending: deque = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.written = 0
+        self.skipped = 0
+        self._sub = None
+        self._task: Optional[asyncio.Task] = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fresh = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not fresh:
+            with open(path, "rb") as f:
+                head = f.read(len(MAGIC))
+            if head != MAGIC:
+                os.replace(path, path + ".v1" if head == MAGIC_V1 else path + ".bad")
+                fresh = True
+            else:
+                _truncate_torn(path)
+        self._f = open(path, "ab")
+        if fresh:
+            self._f.write(MAGIC)
+            self._f.flush()
+        self._thr = threading.Thread(target=self._run, name="meshtui-journal", daemon=True)
+        self._thr.start()
+
+    def append(self, ev: Any, ts: Optional[float] = None) -> None:
+        """Queue ``ev`` stamped with wall time ``ts`` (now by default)."""
+        if len(self._pending) >= self.max_pending:
+            self.skipped += 1
+            return
+        self._pending.append((time.time() if ts is None else ts, ev))
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def follow(self, bus) -> "asyncio.Task":
+        """Subscribe to ``bus`` and feed this writer from a loop task."""
+        sub = self._sub = bus.subscribe("journal", types=tuple(TAGS.values()), policies=JOURNAL_POLICIES)
+
+        async def _pump():
+            # record when the event was emitted, not when the pump got to it
+            async for batch in sub.listen_batches(max_latency=0, stamped=True):
+                wall = time.time() - time.perf_counter()
+                for enq_ts, ev in batch:
+                    self.append(ev, wall + enq_ts)
+
+        self._task = asyncio.get_running_loop().create_task(_pump())
+        return self._task
+
+    def _flush(self) -> None:
+        pending = self._pending
+        if not pending:
+            return
+        out = bytearray()
+        pop = pending.popleft
+        while pending:
+            ts, ev = pop()
+            try:
+                rec = encode(ev, ts)
+            except Exception:
+                rec = None
+            if rec is None:
+                self.skipped += 1
+                continue
+            out += rec
+            self.written += 1
+        if out:
+            self._f.write(out)
+            self._f.flush()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                try:
+                    self._flush()
+                except Exception:
+                    pass
+            self._flush()
+        finally:
+            self._f.close()
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        if self._sub is not None:
+            q = self._sub.queue
+            wall = time.time() - time.perf_counter()
+            while len(q):
+                enq_ts, ev = q.get_stamped_nowait()
+                self.append(ev, wall + enq_ts)
+            self._sub.close()
+            self._sub = None
+        self._stop.set()
+        self._wake.set()
+        # the thread flushes what is left and closes the file itself; if the
+        # disk is stuck we stop waiting rather than write from two threads
+        self._thr.join(timeout=3.0)
+
+
+def _complete_end(mm, start: int) -> int:
+    """Offset just past the last complete record from ``start`` on."""
+    end, pos = len(mm), start
+    while pos + _LEN.size <= end:
+        (n,) = _LEN.unpack_from(mm, pos)
+        if n < _HEAD.size or pos + _LEN.size + n > end:
+            break
+        pos += _LEN.size + n
+    return pos
+
+
+def _truncate_torn(path: str) -> None:
+    # a crash mid-write leaves a partial record; appending after it would
+    # make everything written from now on unreadable
+    with open(path, "r+b") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= len(MAGIC):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            good = _complete_end(mm, len(MAGIC))
+        if good < size:
+            f.truncate(good)
+
+
+def iter_journal(path: str) -> Iterator[Tuple[float, Any]]:
+    """Yield ``(wall_ts, event)`` for every complete record in ``path``.
+
+    Stops at the first truncated or undecodable record.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= len(MAGIC):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic = mm[:len(MAGIC)]
+            if magic not in (MAGIC, MAGIC_V1):
+                raise ValueError(f"{path}: not a meshtui journal")
+            legacy = magic == MAGIC_V1
+            end = len(mm)
+            pos = len(MAGIC)
+            len_size, head_size = _LEN.size, _HEAD.size
+            while pos + len_size <= end:
+                (n,) = _LEN.unpack_from(mm, pos)
+                body = pos + len_size
+                if n < head_size or body + n > end:
+                    break  # truncated tail
+                ts, tag = _HEAD.unpack_from(mm, body)
+                cls = TAGS.get(tag)
+                pos = body + n
+                if cls is None:
+                    continue
+                raw = mm[body + head_size:pos]
+                try:
+                    if legacy:
+                        ev = cls(*marshal.loads(raw))
+                    else:
+                        vals = json.loads(raw)
+                        dec = _DECODE.get(cls)
+                        ev = cls(*(dec(vals) if dec else vals))
+                except (ValueError, TypeError, EOFError):
+                    return  # garbage after a torn record
+                yield ts, ev
+
+
+def replay(path: str, state: Any, realtime: bool = False, speed: float = 1.0,
+           apply: Optional[Callable[[Any, Any], None]] = None) -> int:
+    """Stream a journal through the reducer; returns the number of events applied.
+
+    By default events are applied back to back. With ``realtime=True`` the
+    original spacing is reproduced, divided by ``speed``.
+    """
+    if apply is None:
+        from meshtui.core.reducer import apply_event as apply
+    count = 0
+    first_ts = start = None
+    for ts, ev in iter_journal(path):
+        if realtime:
+            if first_ts is None:
+                first_ts, start = ts, time.monotonic()
+            delay = (ts - first_ts) / max(speed, 1e-6) - (time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
+        apply(state, ev)
+        count += 1
+    return count
+
+
+def main(argv=None) -> int:
+    import argparse
+    from meshtui.core.state import AppState
+
+    p = argparse.ArgumentParser(prog="python -m meshtui.core.journal", description="Replay a meshtui event journal.")
+    p.add_argument("path")
+    p.add_argument("--realtime", action="store_true", help="reproduce the original timing")
+    p.add_argument("--speed", type=float, default=1.0, help="time multiplier for --realtime")
+    args = p.parse_args(argv)
+
+    state = AppState()
+    t0 = time.perf_counter()
+    n = replay(args.path, state, realtime=args.realtime, speed=args.speed)
+    dt = time.perf_counter() - t0
+    rate = n / dt if dt > 0 else float("inf")
+    print(f"replayed {n} events in {dt:.3f}s ({rate:,.0f}/s)")
+    print(f"nodes={len(state.nodes)} chats={sum(len(v) for v in state.chats.values())} log={len(state.log)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,6 +13,7 @@ except Exception:
     pub = None
 
 from meshtui.core import events
+from meshtui.core.ack_registry import ack_registry
 from meshtui.core.events_ext import Position, MsgMeta, Channels, Connection, OwnerInfo, ConnectionFailed
 
 BROADCAST = 0xFFFFFFFF
@@ -32,6 +33,7 @@ class MeshtasticIO:
         self.loop = loop
         self.state = state
         self.cfg = cfg
+        self._ingress = bus.ingress(loop)
         self.iface = None
         self._thr = None
         self._stop = threading.Event()
@@ -39,7 +41,7 @@ class MeshtasticIO:
         self._subscribed = False
 
     def _emit(self, ev):
-        self.loop.call_soon_threadsafe(lambda: self.loop.create_task(self.bus.emit(ev)))
+        self._ingress.push(ev)
 
     # ---------- PubSub callbacks ----------
     def _on_receive(self, packet=None, interface=None, **kwargs):
@@ -57,9 +59,9 @@ class MeshtasticIO:
             rid = _get(routing, "requestId") or _get(packet, "requestId") or _get(packet, "id")
             err = _get(routing, "errorReason") or _get(routing, "error")
             if isinstance(rid, int) and routing:
-                if not err or str(err) == "NONE":
-                    self.state.mark_acked(rid)
-                # else NAK -> leave as is or log
+                # resolved on the loop; transport updates the chat message
+                ok = not err or str(err) == "NONE"
+                ack_registry.set_result(rid, "ACK" if ok else "NAK", _get(packet, "from"))
 
             # now normal text handling
             port = _get(dec, "portnum")
@@ -69,7 +71,17 @@ class MeshtasticIO:
             if text and isinstance(port, str) and port == "TEXT_MESSAGE_APP":
                 self._emit(events.RxText(src=src, text=text, dst=dst))
                 if isinstance(dst, int) and dst == my_num and isinstance(src, int):
-                    self.state.ack_last_pending_from(src)
+                    # chat state belongs to the loop thread
+                    try:
+                        self.loop.call_soon_threadsafe(self.state.ack_last_pending_from, src)
+                    except RuntimeError:
+                        pass  # loop already closed during shutdown
+            elif port == "POSITION_APP" and isinstance(src, int):
+                pos = _get(dec, "position") or {}
+                lat, lon = _get(pos, "latitude"), _get(pos, "longitude")
+                if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
+                    self._emit(Position(num=src, lat=lat, lon=lon,
+                                        alt=_get(pos, "altitude"), ts=_get(pos, "time")))
 
             self.state.last_rx_time = time.time()
         except Exception as e:
@@ -78,7 +90,7 @@ class MeshtasticIO:
     def _on_ack(self, packet=None, interface=None, **kwargs):
         aid = (_get(packet, "requestId") or _get(packet, "request_id") or _get(packet, "id"))
         if isinstance(aid, int):
-            self.state.mark_acked(aid)
+            ack_registry.set_result(aid, "ACK", _get(packet, "from"))
 
     def _on_connection(self, interface=None, event_name=None, **kwargs):
         name = event_name or ""
@@ -98,7 +110,7 @@ class MeshtasticIO:
             num = n.get("num")
             short = n.get("user", {}).get("longName") or n.get("shortName") or f"{num:x}"
             ts = n.get("lastHeard") or time.time()
-            self._emit(events.Beacon(num=num, short=short, ts=ts))
+            self._emit(events.Beacon(num=num, short=short, ts=ts, snr=n.get("snr"), hops=n.get("hopsAway")))
         except Exception:
             pass
 
@@ -132,7 +144,7 @@ class MeshtasticIO:
                 user = _get(n, "user", {})
                 short = _get(user, "longName") or _get(user, "shortName") or f"{num:x}"
                 ts = _get(n, "lastHeard") or time.time()
-                self._emit(events.Beacon(num=num, short=short, ts=ts))
+                self._emit(events.Beacon(num=num, short=short, ts=ts, snr=_get(n, "snr"), hops=_get(n, "hopsAway")))
 
                 pos = _get(n, "position")
                 if pos:
@@ -0,0 +1,121 @@
+# meshtui/core/metrics.py
+from collections import deque
+from typing import Any, Dict, Sequence
+
+
+class _TypeStats:
+    __slots__ = ("count", "reducer_total", "reducer_max", "latency_total", "latency_max")
+
+    def __init__(self):
+        self.count = 0
+        self.reducer_total = 0.0
+        self.reducer_max = 0.0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+
+def _pct(sorted_vals, q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+
+class BusMetrics:
+    """Counters filled in by the bus consumer, one ``observe`` per event.
+
+    Times are seconds from ``time.perf_counter``. Only aggregates plus a short
+    window of recent latencies are kept, so cost per event is O(1).
+    """
+
+    def __init__(self, window: int = 512):
+        self._types: Dict[str, _TypeStats] = {}
+        self._recent_latency: deque = deque(maxlen=window)
+        self._recent_reducer: deque = deque(maxlen=window)
+        self.events = 0
+        self.batches = 0
+
+    def observe(self, type_name: str, latency: float, reducer_time: float) -> None:
+        st = self._types.get(type_name)
+        if st is None:
+            st = self._types[type_name] = _TypeStats()
+        st.count += 1
+        st.reducer_total += reducer_time
+        st.latency_total += latency
+        if reducer_time > st.reducer_max:
+            st.reducer_max = reducer_time
+        if latency > st.latency_max:
+            st.latency_max = latency
+        self._recent_latency.append(latency)
+        self._recent_reducer.append(reducer_time)
+        self.events += 1
+
+    def observe_batch(self) -> None:
+        self.batches += 1
+
+    def reset(self) -> None:
+        self._types.clear()
+        self._recent_latency.clear()
+        self._recent_reducer.clear()
+        self.events = 0
+        self.batches = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        lat = sorted(self._recent_latency)
+        red = sorted(self._recent_reducer)
+        return {
+            "events": self.events,
+            "batches": self.batches,
+            "latency_p50": _pct(lat, 0.50),
+            "latency_p95": _pct(lat, 0.95),
+            "latency_max": lat[-1] if lat else 0.0,
+            "reducer_p50": _pct(red, 0.50),
+            "reducer_p95": _pct(red, 0.95),
+            "types": {
+                name: {
+                    "count": st.count,
+                    "latency_avg": st.latency_total / st.count,
+                    "latency_max": st.latency_max,
+                    "reducer_avg": st.reducer_total / st.count,
+                    "reducer_max": st.reducer_max,
+                }
+                for name, st in self._types.items()
+            },
+        }
+
+
+class RollingHistogram:
+    """The last ``window`` samples, summarized on demand.
+
+    ``add`` is a deque append; sorting and bucketing happen only in
+    ``snapshot``. ``edges`` are upper bucket bounds; anything above the last
+    edge lands in a final overflow bucket.
+    """
+
+    def __init__(self, edges: Sequence[float], window: int = 256):
+        self.edges = tuple(edges)
+        self._recent: deque = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self._recent.append(value)
+        self.count += 1
+
+    def clear(self) -> None:
+        self._recent.clear()
+        self.count = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        vals = sorted(self._recent)
+        buckets = [0] * (len(self.edges) + 1)
+        i = 0
+        for v in vals:
+            while i < len(self.edges) and v > self.edges[i]:
+                i += 1
+            buckets[i] += 1
+        return {
+            "count": self.count,
+            "p50": _pct(vals, 0.50),
+            "p95": _pct(vals, 0.95),
+            "max": vals[-1] if vals else 0.0,
+            "buckets": buckets,
+        }
@@ -15,13 +15,13 @@ class MQTTClient:
         self.loop = loop
         self.state = state
         self.cfg = cfg
+        self._ingress = bus.ingress(loop)
         self.client: Optional["mqtt.Client"] = None
         self._connected = False
 
     def _emit(self, ev):
-        if self.state and hasattr(self.state, "add_log") and isinstance(getattr(ev, "text", None), str):
-            self.state.add_log(ev.text)
-        self.loop.call_soon_threadsafe(lambda: self.loop.create_task(self.bus.emit(ev)))
+        # paho's thread: state is only touched by the reducer, on the loop
+        self._ingress.push(ev)
 
     # paho callbacks
     def _on_connect(self, client, userdata, flags, rc, properties=None):
@@ -0,0 +1,162 @@
+# meshtui/core/ordering.py
+"""Node orderings that are kept sorted as nodes change.
+
+``AppState`` owns one :class:`NodeIndex` per ordering in use. Every node
+mutation re-keys just that node (a remove plus an insert into a bucketed
+sorted list), so views can read the current order every frame without a
+full ``sorted()`` over all nodes.
+"""
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+KeyFn = Callable[[Any], Tuple]
+
+# Every key ends with the node number, so keys are unique and ties between
+# equal names/values always come out in the same order.
+ORDERINGS: Dict[str, KeyFn] = {
+    "recent": lambda n: (-n.last, n.short, n.num),
+    "name": lambda n: (n.short.casefold(), n.num),
+    "snr": lambda n: (n.snr is None, -(n.snr or 0.0), n.short, n.num),
+    "hops": lambda n: (n.hops is None, n.hops or 0, n.short, n.num),
+}
+
+_LOAD = 256
+
+
+class SortedKeys:
+    """Sorted sequence of unique keys stored as a list of short sorted buckets.
+
+    Insert and remove bisect the bucket maxima, then the bucket, so the cost
+    is O(log n) comparisons plus a memmove of at most ``2 * load`` slots.
+    Positional reads go through a prefix table that is rebuilt lazily (one
+    entry per bucket) after a structural change.
+    """
+
+    def __init__(self, load: int = _LOAD):
+        self._load = load
+        self._lists: List[list] = []
+        self._maxes: List[Any] = []
+        self._starts: Optional[List[int]] = None
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._lists)
+
+    def add(self, key: Any) -> None:
+        lists, maxes = self._lists, self._maxes
+        if not maxes:
+            lists.append([key])
+            maxes.append(key)
+        else:
+            i = bisect_left(maxes, key)
+            if i == len(maxes):
+                i -= 1
+                lists[i].append(key)
+                maxes[i] = key
+            else:
+                insort(lists[i], key)
+            if len(lists[i]) > 2 * self._load:
+                lst = lists[i]
+                lists.insert(i + 1, lst[self._load:])
+                del lst[self._load:]
+                maxes.insert(i, lst[-1])
+        self._len += 1
+        self._starts = None
+
+    def remove(self, key: Any) -> None:
+        lists, maxes = self._lists, self._maxes
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            raise KeyError(key)
+        lst = lists[i]
+        j = bisect_left(lst, key)
+        if j == len(lst) or lst[j] != key:
+            raise KeyError(key)
+        del lst[j]
+        self._len -= 1
+        self._starts = None
+        if not lst:
+            del lists[i]
+            del maxes[i]
+            return
+        if j == len(lst):
+            maxes[i] = lst[-1]
+        # fold a shrunken bucket into its right neighbour so churn cannot
+        # leave behind thousands of tiny buckets
+        if len(lst) < self._load // 2 and i + 1 < len(lists) and len(lst) + len(lists[i + 1]) <= 2 * self._load:
+            lst.extend(lists[i + 1])
+            maxes[i] = maxes[i + 1]
+            del lists[i + 1]
+            del maxes[i + 1]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(self._len)
+            if step != 1:
+                return list(self)[idx]
+            if start >= stop:
+                return []
+            b, off = self._locate(start)
+            return list(islice(chain(self._lists[b][off:], chain.from_iterable(self._lists[b + 1:])), stop - start))
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError("index out of range")
+        b, off = self._locate(idx)
+        return self._lists[b][off]
+
+    def _locate(self, idx: int) -> Tuple[int, int]:
+        starts = self._starts
+        if starts is None:
+            starts, total = [], 0
+            for lst in self._lists:
+                starts.append(total)
+                total += len(lst)
+            self._starts = starts
+        b = bisect_right(starts, idx) - 1
+        return b, idx - starts[b]
+
+
+class NodeIndex:
+    """One ordering over ``AppState.nodes``; reads like a list of node records."""
+
+    def __init__(self, key_fn: KeyFn, nodes: Dict[int, Any]):
+        self.key_fn = key_fn
+        self._nodes = nodes
+        self._keys: Dict[int, Tuple] = {}
+        self._sorted = SortedKeys()
+        for n in nodes.values():
+            self.update(n)
+
+    def update(self, node: Any) -> None:
+        num = node.num
+        new = self.key_fn(node)
+        old = self._keys.get(num)
+        if old == new:
+            return
+        if old is not None:
+            self._sorted.remove(old)
+        self._sorted.add(new)
+        self._keys[num] = new
+
+    def discard(self, num: int) -> None:
+        old = self._keys.pop(num, None)
+        if old is not None:
+            self._sorted.remove(old)
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def __iter__(self) -> Iterator[Any]:
+        nodes = self._nodes
+        return (nodes[k[-1]] for k in self._sorted)
+
+    def __getitem__(self, idx):
+        nodes = self._nodes
+        if isinstance(idx, slice):
+            return [nodes[k[-1]] for k in self._sorted[idx]]
+        return nodes[self._sorted[idx][-1]]
@@ -0,0 +1,80 @@
+# meshtui/core/records.py
+"""Compact per-node records for ``AppState.nodes``.
+
+Nodes used to be plain dicts with nested ``pos``/``meta`` dicts. These
+``__slots__`` classes hold the same fields at a fraction of the memory and
+keep the mapping-style reads (``n["short"]``, ``n.get("pos")``) the views
+were written against. New code should use attribute access.
+"""
+from typing import Any, FrozenSet, Iterator, Optional
+
+
+class _Record:
+    __slots__ = ()
+    _fields: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kw):
+        super().__init_subclass__(**kw)
+        cls._fields = frozenset(cls.__slots__)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._fields:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._fields:
+            return default
+        return getattr(self, key)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __repr__(self) -> str:
+        body = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"{type(self).__name__}({body})"
+
+
+class GeoPos(_Record):
+    __slots__ = ("lat", "lon", "alt", "ts")
+
+    def __init__(self, lat: float, lon: float, alt: Optional[float], ts: float):
+        self.lat = lat
+        self.lon = lon
+        self.alt = alt
+        self.ts = ts
+
+
+class NodeMeta(_Record):
+    """Metadata of the last packet heard from a node."""
+    __slots__ = ("encrypted", "channel", "hop", "rx", "last_msg_id")
+
+    def __init__(self, encrypted: bool, channel: Optional[int], hop: Optional[int],
+                 rx: float, last_msg_id: Optional[str]):
+        self.encrypted = encrypted
+        self.channel = channel
+        self.hop = hop
+        self.rx = rx
+        self.last_msg_id = last_msg_id
+
+
+class NodeRecord(_Record):
+    __slots__ = ("num", "short", "last", "dm", "pos", "meta", "snr", "hops")
+
+    def __init__(self, num: int, short: str, last: float, dm: bool = False):
+        self.num = num
+        self.short = short
+        self.last = last
+        self.dm = dm
+        self.pos: Optional[GeoPos] = None
+        self.meta: Optional[NodeMeta] = None
+        self.snr: Optional[float] = None
+        self.hops: Optional[int] = None
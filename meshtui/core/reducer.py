@@ -1,32 +1,121 @@
 # meshtui/core/reducer.py
 import time
+from typing import Any, Callable, Dict, List, Tuple, Type
 from meshtui.core import events
 from meshtui.core.events_ext import Position, MsgMeta, Channels, Connection, OwnerInfo
 from meshtui.core.meshtastic_io import BROADCAST
 
+Handler = Callable[[Any, Any], None]
+
+# event type -> handlers registered directly on that type
+_HANDLERS: Dict[type, List[Handler]] = {}
+# concrete event type -> single resolved callable (own + inherited handlers)
+_RESOLVED: Dict[type, Handler] = {}
+
+
+def register(ev_type: Type, handler: Handler) -> Handler:
+    """Add ``handler(state, ev)`` for ``ev_type`` and all of its subclasses.
+
+    Handlers stack: registering for a type that already has one appends,
+    so telemetry/persistence hooks can ride along with the core handler.
+    Registering for ``object`` observes every event.
+    """
+    _HANDLERS.setdefault(ev_type, []).append(handler)
+    _RESOLVED.clear()
+    return handler
+
+
+def unregister(ev_type: Type, handler: Handler) -> None:
+    lst = _HANDLERS.get(ev_type)
+    if lst and handler in lst:
+        lst.remove(handler)
+        _RESOLVED.clear()
+
+
+def handles(ev_type: Type) -> Callable[[Handler], Handler]:
+    def deco(fn: Handler) -> Handler:
+        return register(ev_type, fn)
+    return deco
+
+
+def _noop(state, ev):
+    pass
+
+
+def _fan_out(hs: Tuple[Handler, ...]) -> Handler:
+    def _run(state, ev):
+        for h in hs:
+            h(state, ev)
+    return _run
+
+
+def _resolve(cls: type) -> Handler:
+    # Most generic first, so an ``object`` observer sees the event before
+    # subclass-specific handlers run.
+    out: List[Handler] = []
+    for base in reversed(cls.__mro__):
+        out.extend(_HANDLERS.get(base, ()))
+    if not out:
+        found = _noop
+    elif len(out) == 1:
+        found = out[0]
+    else:
+        found = _fan_out(tuple(out))
+    _RESOLVED[cls] = found
+    return found
+
+
 def apply_event(state, ev):
-    if isinstance(ev, events.Beacon):
-        state.upsert_node(ev.num, ev.short, ev.ts)
-    elif isinstance(ev, events.RxText):
-        state.last_rx_time = time.time()
-        if ev.dst == BROADCAST:
-            state.add_chat(None, ev.text, me=False, sender_id=ev.src)
-        else:
-            state.add_chat(ev.src, ev.text, me=False, sender_id=ev.src)
-    elif isinstance(ev, events.Ack):
-        state.add_log(f"ACK {ev.msg_id}")
-    elif isinstance(ev, events.Log):
-        state.add_log(ev.text)
-    elif isinstance(ev, events.Ports):
-        state.add_log("Ports: " + (", ".join(ev.items) if ev.items else "none"))
-    elif isinstance(ev, Position):
-        state.set_position(ev.num, ev.lat, ev.lon, ev.alt, ev.ts)
-    elif isinstance(ev, MsgMeta):
-        state.set_msg_meta(ev.src, ev.dst, ev.encrypted, ev.channel, ev.hop_limit, ev.rx_time, ev.msg_id)
-    elif isinstance(ev, Channels):
-        state.set_channels(ev.items)
-        state.add_log("Channels: " + (", ".join(f"{i}:{n}" for i, n in ev.items) if ev.items else "none"))
-    elif isinstance(ev, Connection):
-        state.add_log("Connected" if ev.up else "Disconnected")
-    elif isinstance(ev, OwnerInfo):
-        state.add_log(f"Owner: {ev.long} / {ev.short}")
+    cls = type(ev)
+    h = _RESOLVED.get(cls)
+    if h is None:
+        h = _resolve(cls)
+    h(state, ev)
+
+
+# -------- Core handlers ---------------------------------------------------
+
+@handles(events.Beacon)
+def _on_beacon(state, ev):
+    state.upsert_node(ev.num, ev.short, ev.ts, ev.snr, ev.hops)
+
+@handles(events.RxText)
+def _on_rx_text(state, ev):
+    state.last_rx_time = time.time()
+    if ev.dst == BROADCAST:
+        state.add_chat(None, ev.text, me=False, sender_id=ev.src)
+    else:
+        state.add_chat(ev.src, ev.text, me=False, sender_id=ev.src)
+
+@handles(events.Ack)
+def _on_ack(state, ev):
+    state.add_log(f"ACK {ev.msg_id}")
+
+@handles(events.Log)
+def _on_log(state, ev):
+    state.add_log(ev.text)
+
+@handles(events.Ports)
+def _on_ports(state, ev):
+    state.add_log("Ports: " + (", ".join(ev.items) if ev.items else "none"))
+
+@handles(Position)
+def _on_position(state, ev):
+    state.set_position(ev.num, ev.lat, ev.lon, ev.alt, ev.ts)
+
+@handles(MsgMeta)
+def _on_msg_meta(state, ev):
+    state.set_msg_meta(ev.src, ev.dst, ev.encrypted, ev.channel, ev.hop_limit, ev.rx_time, ev.msg_id)
+
+@handles(Channels)
+def _on_channels(state, ev):
+    state.set_channels(ev.items)
+    state.add_log("Channels: " + (", ".join(f"{i}:{n}" for i, n in ev.items) if ev.items else "none"))
+
+@handles(Connection)
+def _on_connection(state, ev):
+    state.add_log("Connected" if ev.up else "Disconnected")
+
+@handles(OwnerInfo)
+def _on_owner(state, ev):
+    state.add_log(f"Owner: {ev.long} / {ev.short}")
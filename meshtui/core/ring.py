@@ -0,0 +1,62 @@
+# meshtui/core/ring.py
+from typing import Any, Iterator, List
+
+
+class RingBuffer:
+    """Fixed-capacity FIFO over a preallocated list.
+
+    ``append`` overwrites the oldest entry once full; indexing is O(1) from
+    either end (unlike a deque, whose middle is O(n)). ``appended`` counts
+    every append ever made, so ``first_seq`` gives the running sequence
+    number of ``self[0]`` and readers can tell how many entries were evicted
+    since they last looked.
+    """
+
+    __slots__ = ("_buf", "_cap", "_start", "_len", "appended")
+
+    def __init__(self, maxlen: int):
+        if maxlen < 1:
+            raise ValueError("maxlen must be >= 1")
+        self._buf: List[Any] = [None] * maxlen
+        self._cap = maxlen
+        self._start = 0
+        self._len = 0
+        self.appended = 0
+
+    @property
+    def maxlen(self) -> int:
+        return self._cap
+
+    @property
+    def first_seq(self) -> int:
+        return self.appended - self._len
+
+    def append(self, item: Any) -> None:
+        if self._len < self._cap:
+            self._buf[(self._start + self._len) % self._cap] = item
+            self._len += 1
+        else:
+            self._buf[self._start] = item
+            self._start = (self._start + 1) % self._cap
+        self.appended += 1
+
+    def clear(self) -> None:
+        self._buf = [None] * self._cap
+        self._start = self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._len))]
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError("ring index out of range")
+        return self._buf[(self._start + idx) % self._cap]
+
+    def __iter__(self) -> Iterator[Any]:
+        buf, cap, start = self._buf, self._cap, self._start
+        for i in range(self._len):
+            yield buf[(start + i) % cap]
@@ -0,0 +1,294 @@
+# meshtui/core/simulator.py
+"""Synthetic mesh traffic for load-testing without a radio.
+
+``SimulatedIO`` is a drop-in ``MeshtasticIO`` whose worker thread, instead of
+opening a serial/TCP interface, fabricates dict packets and feeds them to the
+same ``_on_receive`` / ``_on_node`` / ``_on_connection`` callbacks the
+meshtastic pubsub would call.
+
+Scenario files are JSON; every key is optional::
+
+    {
+      "nodes": 50,              # simulated remote nodes
+      "rate": 100,              # packets per second
+      "duration": 60,           # seconds, 0 = until stopped
+      "seed": 1,
+      "center": [40.0, -74.0],  # lat, lon the nodes scatter around
+      "radius_km": 5,
+      "dm_fraction": 0.1,       # share of text packets addressed to us
+      "ack_delay": [0.5, 4.0],  # min/max seconds before our sends are ACKed
+      "mix": {"text": 20, "ack": 10, "nodeinfo": 10, "position": 30, "telemetry": 30}
+    }
+"""
+import heapq
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from meshtui.core.meshtastic_io import MeshtasticIO, BROADCAST
+
+_WORDS = ("ok", "copy", "anyone", "on", "the", "mesh", "test", "relay", "hiking", "summit",
+          "battery", "low", "heading", "north", "see", "you", "at", "camp", "signal", "good")
+
+
+@dataclass
+class Scenario:
+    nodes: int = 50
+    rate: float = 100.0
+    duration: float = 0.0
+    seed: Optional[int] = None
+    center: Tuple[float, float] = (40.0, -74.0)
+    radius_km: float = 5.0
+    dm_fraction: float = 0.1
+    ack_delay: Tuple[float, float] = (0.5, 4.0)
+    mix: Dict[str, float] = field(default_factory=lambda: {
+        "text": 20, "ack": 10, "nodeinfo": 10, "position": 30, "telemetry": 30,
+    })
+    my_node_num: int = 0x0A11CE00
+
+    @staticmethod
+    def load(path: str) -> "Scenario":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        sc = Scenario()
+        for k, v in data.items():
+            if hasattr(sc, k):
+                setattr(sc, k, tuple(v) if isinstance(v, list) else v)
+        return sc
+
+
+class _FakeInterface:
+    """The subset of meshtastic's interface object that MeshtasticIO touches."""
+
+    def __init__(self, sim: "SimulatedIO", sc: Scenario, rng: random.Random):
+        self._sim = sim
+        self.myInfo = {"my_node_num": sc.my_node_num,
+                       "user": {"longName": "Simulator", "shortName": "SIM"}}
+        self.channels = [{"index": 0, "settings": {"name": "LongFast"}},
+                         {"index": 1, "settings": {"name": "SimOps"}}]
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        lat0, lon0 = sc.center
+        for i in range(sc.nodes):
+            num = 0x10000000 + i
+            r = sc.radius_km * math.sqrt(rng.random())
+            a = rng.random() * 2 * math.pi
+            self.nodes[f"!{num:08x}"] = {
+                "num": num,
+                "user": {"longName": f"Sim Node {i}", "shortName": f"S{i:03d}"[-4:]},
+                "lastHeard": time.time() - rng.random() * 3600,
+                "snr": round(rng.uniform(-15, 10), 1),
+                "hopsAway": rng.randint(0, 4),
+                "position": {
+                    "latitude": lat0 + (r * math.cos(a)) / 111.0,
+                    "longitude": lon0 + (r * math.sin(a)) / (111.0 * max(0.1, math.cos(math.radians(lat0)))),
+                    "altitude": rng.randint(0, 400),
+                    "time": int(time.time()),
+                },
+            }
+
+    def sendText(self, text, destinationId=BROADCAST, wantAck=False, **kwargs):
+        return {"id": self._sim._queue_ack(destinationId) if wantAck else self._sim._next_id()}
+
+    def sendTraceRoute(self, dest, *a, **k):
+        return None
+
+    def close(self):
+        pass
+
+
+class SimulatedIO(MeshtasticIO):
+    def __init__(self, bus, loop, state, cfg, scenario: Optional[Scenario] = None):
+        super().__init__(bus, loop, state, cfg)
+        self.scenario = scenario or Scenario()
+        self._rng = random.Random(self.scenario.seed)
+        self._ids = itertools.count(self._rng.randint(1, 1 << 24))
+        self._acks: List[Tuple[float, int, Any]] = []
+        self._ack_lock = threading.Lock()
+        self.generated: Dict[str, int] = {}
+
+    # ---------- fabricated packets ----------
+    def _next_id(self) -> int:
+        return next(self._ids) & 0xFFFFFFFF
+
+    def _queue_ack(self, dest) -> int:
+        pid = self._next_id()
+        lo, hi = self.scenario.ack_delay
+        with self._ack_lock:
+            heapq.heappush(self._acks, (time.monotonic() + self._rng.uniform(lo, hi), pid, dest))
+        return pid
+
+    def _pick_node(self) -> Dict[str, Any]:
+        nodes = self.iface.nodes
+        return nodes[self._rng.choice(list(nodes))] if nodes else {}
+
+    def _packet(self, node, portnum: str, decoded: Dict[str, Any], to=BROADCAST) -> Dict[str, Any]:
+        d = {"portnum": portnum}
+        d.update(decoded)
+        return {"from": node.get("num"), "to": to, "id": self._next_id(), "decoded": d,
+                "rxTime": int(time.time()), "rxSnr": node.get("snr"), "hopLimit": 3 - min(3, node.get("hopsAway", 0))}
+
+    def _routing_ack(self, pid: int, dest) -> Dict[str, Any]:
+        src = dest if isinstance(dest, int) and dest != BROADCAST else self._pick_node().get("num")
+        return {"from": src, "to": self.scenario.my_node_num, "id": self._next_id(), "requestId": pid,
+                "decoded": {"portnum": "ROUTING_APP", "requestId": pid, "routing": {"errorReason": "NONE"}}}
+
+    def _gen_text(self):
+        node = self._pick_node()
+        to = self.scenario.my_node_num if self._rng.random() < self.scenario.dm_fraction else BROADCAST
+        text = " ".join(self._rng.choice(_WORDS) for _ in range(self._rng.randint(1, 12)))
+        self._on_receive(packet=self._packet(node, "TEXT_MESSAGE_APP", {"text": text}, to=to), interface=self.iface)
+
+    def _gen_ack(self):
+        # an ACK for somebody else's traffic; ours come from _flush_acks
+        self._on_receive(packet=self._routing_ack(self._next_id(), None), interface=self.iface)
+
+    def _gen_nodeinfo(self):
+        node = self._pick_node()
+        node["lastHeard"] = time.time()
+        node["snr"] = round(self._rng.uniform(-15, 10), 1)
+        self._on_receive(packet=self._packet(node, "NODEINFO_APP", {"user": node["user"]}), interface=self.iface)
+        self._on_node(node=node, interface=self.iface)
+
+    def _gen_position(self):
+        node = self._pick_node()
+        pos = node["position"]
+        pos["latitude"] += self._rng.uniform(-1e-4, 1e-4)
+        pos["longitude"] += self._rng.uniform(-1e-4, 1e-4)
+        pos["time"] = int(time.time())
+        node["lastHeard"] = time.time()
+        self._on_receive(packet=self._packet(node, "POSITION_APP", {"position": dict(pos)}), interface=self.iface)
+        self._on_node(node=node, interface=self.iface)
+
+    def _gen_telemetry(self):
+        node = self._pick_node()
+        metrics = {"batteryLevel": self._rng.randint(5, 100), "voltage": round(self._rng.uniform(3.3, 4.2), 2),
+                   "channelUtilization": round(self._rng.uniform(0, 40), 1),
+                   "airUtilTx": round(self._rng.uniform(0, 10), 2)}
+        self._on_receive(packet=self._packet(node, "TELEMETRY_APP", {"telemetry": {"deviceMetrics": metrics}}),
+                         interface=self.iface)
+
+    def _flush_acks(self) -> None:
+        now = time.monotonic()
+        due = []
+        with self._ack_lock:
+            while self._acks and self._acks[0][0] <= now:
+                due.append(heapq.heappop(self._acks))
+        for _, pid, dest in due:
+            self._on_receive(packet=self._routing_ack(pid, dest), interface=self.iface)
+
+    # ---------- worker ----------
+    def _worker(self, first_port):
+        sc = self.scenario
+        gens = {"text": self._gen_text, "ack": self._gen_ack, "nodeinfo": self._gen_nodeinfo,
+                "position": self._gen_position, "telemetry": self._gen_telemetry}
+        kinds = [k for k in gens if sc.mix.get(k, 0) > 0]
+        weights = [sc.mix[k] for k in kinds]
+        self.iface = _FakeInterface(self, sc, self._rng)
+        self._on_connection(interface=self.iface, event_name="meshtastic.connection.established")
+
+        start = time.monotonic()
+        sent = 0
+        try:
+            while not self._stop.is_set():
+                elapsed = time.monotonic() - start
+                if sc.duration and elapsed >= sc.duration:
+                    break
+                self._flush_acks()
+                due = int(elapsed * sc.rate) - sent
+                if due > 0 and kinds:
+                    for kind in self._rng.choices(kinds, weights, k=due):
+                        gens[kind]()
+                        self.generated[kind] = self.generated.get(kind, 0) + 1
+                    sent += due
+                time.sleep(min(0.05, max(0.001, 1.0 / max(sc.rate, 1e-3))))
+        finally:
+            self._on_connection(interface=self.iface, event_name="meshtastic.connection.lost")
+
+    def start(self, port=None):
+        super().start(port=port or "sim://")
+
+
+# -------- CLI -------------------------------------------------------------
+
+async def _headless(sc: Scenario, report_every: float) -> None:
+    import asyncio
+    from meshtui.core.bus import Bus
+    from meshtui.core.state import AppState
+    from meshtui.core.reducer import apply_event
+
+    loop = asyncio.get_running_loop()
+    state, bus = AppState(), Bus()
+    io = SimulatedIO(bus, loop, state, None, sc)
+
+    async def consume():
+        observe, clock = bus.metrics.observe, time.perf_counter
+        async for batch in bus.listen_batches(stamped=True):
+            for enq_ts, ev in batch:
+                t0 = clock()
+                apply_event(state, ev)
+                observe(type(ev).__name__, t0 - enq_ts, clock() - t0)
+
+    consumer = asyncio.create_task(consume())
+    io.start()
+    t0 = time.monotonic()
+    last_gen = 0
+    try:
+        while io._thr and io._thr.is_alive():
+            await asyncio.sleep(report_every)
+            snap = bus.snapshot()
+            gen = sum(io.generated.values())
+            el = time.monotonic() - t0
+            print(f"[{el:6.1f}s] gen {gen:>8} ({(gen - last_gen) / report_every:7.0f}/s)  "
+                  f"applied {snap['events']:>8}  depth {snap['depth']:>5} (hw {snap['high_water']})  "
+                  f"lat p95 {snap['latency_p95'] * 1000:6.2f}ms  red p95 {snap['reducer_p95'] * 1e6:6.1f}us  "
+                  f"nodes {len(state.nodes)}", flush=True)
+            last_gen = gen
+    finally:
+        io.stop()
+        consumer.cancel()
+    snap = bus.snapshot()
+    print("generated:", dict(sorted(io.generated.items())))
+    print("coalesced:", snap["coalesced"], "dropped:", snap["dropped"])
+
+
+def main(argv=None) -> int:
+    import argparse
+    import asyncio
+
+    p = argparse.ArgumentParser(prog="meshtui-sim", description="Drive meshtui with synthetic mesh traffic.")
+    p.add_argument("scenario", nargs="?", help="scenario JSON file")
+    p.add_argument("--rate", type=float, help="packets per second (overrides scenario)")
+    p.add_argument("--nodes", type=int, help="simulated node count (overrides scenario)")
+    p.add_argument("--duration", type=float, help="seconds to run, 0 = forever (overrides scenario)")
+    p.add_argument("--seed", type=int)
+    p.add_argument("--tui", action="store_true", help="run the full TUI against the simulator")
+    p.add_argument("--report", type=float, default=1.0, help="headless report interval in seconds")
+    args = p.parse_args(argv)
+
+    sc = Scenario.load(args.scenario) if args.scenario else Scenario(duration=10.0)
+    for k in ("rate", "nodes", "duration", "seed"):
+        v = getattr(args, k)
+        if v is not None:
+            setattr(sc, k, v)
+
+    try:
+        if args.tui:
+            from meshtui.main import main as tui_main
+            asyncio.run(tui_main(
+                io_factory=lambda bus, loop, state, cfg: SimulatedIO(bus, loop, state, cfg, sc),
+                port="sim://",
+            ))
+        else:
+            asyncio.run(_headless(sc, args.report))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,11 +1,19 @@
 # meshtui/core/state.py
 import asyncio
 import time
-from collections import deque, defaultdict
+from collections import defaultdict
 from typing import Dict, Optional, List, Tuple, Set
-from meshtui.ui_ptk.text_sanitize import sanitize_text
+from meshtui.core.ack_registry import ack_registry
+from meshtui.core.delivery import DeliveryTracker
+from meshtui.core.geo import GridIndex
+from meshtui.core.ordering import ORDERINGS, NodeIndex
+from meshtui.core.records import GeoPos, NodeMeta, NodeRecord
+from meshtui.core.ring import RingBuffer
+from meshtui.core.text import sanitize_text
 from meshtui.model import ChatMsg, MsgStatus, next_msg_id
 
+CHAT_HISTORY = 1000  # messages kept per conversation
+
 def _to_int(x):
     try:
         return int(str(x), 10)
@@ -14,22 +22,60 @@ def _to_int(x):
 
 class AppState:
     def __init__(self):
-        self.nodes: Dict[int, Dict] = {}
+        self.nodes: Dict[int, NodeRecord] = {}
         self.dm_target: Optional[int] = None
-        self.log = deque(maxlen=2000)
+        self.log = RingBuffer(2000)
         self.channels: List[Tuple[int, str]] = []
         self.active_channels: Set[int] = set()
-        self.chats: dict[int, list[ChatMsg]] = defaultdict(list)
+        self.chats: dict[int, RingBuffer] = defaultdict(lambda: RingBuffer(CHAT_HISTORY))
         self.msg_index: dict[int, ChatMsg] = {}
         self.msg_by_delivery: dict[int, ChatMsg] = {}
+        self.deliveries = DeliveryTracker(self, ack_registry)
         self.last_rx_time: float = 0.0
 
+        # Monotonic change counters; views key their render caches on these.
+        # ``version`` moves whenever any of the others does.
+        self.version = 0
+        self.ver_nodes = 0
+        self.ver_positions = 0
+        self.ver_log = 0
+        self.ver_channels = 0
+        self.chat_ver: Dict[int, int] = defaultdict(int)
+        # sort orders over ``nodes``; "recent" always exists, others on demand
+        self._orders: Dict[str, NodeIndex] = {"recent": NodeIndex(ORDERINGS["recent"], self.nodes)}
+        # projected positions, bucketed for viewport queries by the map
+        self.spatial = GridIndex()
+
         welcome_text = f"Welcome to Meshtui! - {time.strftime('%Y-%m-%d %H:%M:%S')}"
         self.add_chat(peer=None, text=welcome_text, is_system_message=True)
 
+    # -------- versioning --------
+    def _touch_nodes(self):
+        self.ver_nodes += 1
+        self.version += 1
+
+    def _reindex(self, n: NodeRecord):
+        for idx in self._orders.values():
+            idx.update(n)
+
+    def _touch_positions(self):
+        self.ver_positions += 1
+        self.ver_nodes += 1
+        self.version += 1
+
+    def _touch_chat(self, key: int):
+        self.chat_ver[key] += 1
+        self.version += 1
+
+    def touch_msg(self, m: ChatMsg):
+        """Record a change to ``m`` (e.g. a status flip) for the chat view."""
+        self._touch_chat(-1 if m.to in (None, -1, 0xFFFFFFFF) else m.to)
+
     def add_log(self, text: str):
         t = time.strftime("%H:%M:%S")
         self.log.append(f"[{t}] {sanitize_text(text)}")
+        self.ver_log += 1
+        self.version += 1
 
     def add_chat(self, peer: int | None, text: str, me: bool = False,
                  sender_id: int | None = None, is_system_message: bool = False):
@@ -39,7 +85,8 @@ class AppState:
         elif me:
             prefix = "You: "
         else:
-            sender_name = self.nodes.get(sender_id, {}).get("short", f"#{sender_id:x}") if sender_id is not None else "Unknown"
+            sender = self.nodes.get(sender_id) if sender_id is not None else None
+            sender_name = sender.short if sender is not None else (f"#{sender_id:x}" if sender_id is not None else "Unknown")
             if len(sender_name) > 15:
                 sender_name = sender_name[:12] + "..."
             prefix = f"{sender_name}: "
@@ -47,11 +94,13 @@ class AppState:
         status = MsgStatus.ACKED if is_system_message else MsgStatus.SENT
         m = ChatMsg(id=next_msg_id(), to=key, text=txt, status=status)
         self.chats[key].append(m)
+        self._touch_chat(key)
 
     def add_outgoing(self, to: int, text: str) -> ChatMsg:
         m = ChatMsg(id=next_msg_id(), to=to, text=f"You: {text}", status=MsgStatus.PENDING)
         self.chats[to if to != 0xFFFFFFFF else -1].append(m)
         self.msg_index[m.id] = m
+        self.touch_msg(m)
         return m
 
     def bind_delivery_ids(self, msg: ChatMsg, *ids: int):
@@ -60,6 +109,7 @@ class AppState:
             if di is not None:
                 self.msg_by_delivery[di] = msg
         msg.status = MsgStatus.SENT
+        self.touch_msg(msg)
 
     def bind_delivery_id(self, msg: ChatMsg, delivery_id: int | None):
         # keep compatibility
@@ -69,60 +119,121 @@ class AppState:
     def mark_acked(self, delivery_id: int):
         di = _to_int(delivery_id)
         if di is not None and di in self.msg_by_delivery:
-            self.msg_by_delivery[di].status = MsgStatus.ACKED
+            m = self.msg_by_delivery[di]
+            m.status = MsgStatus.ACKED
+            self.touch_msg(m)
+
+    def mark_failed(self, delivery_id: int) -> bool:
+        """FAILED unless already acknowledged; True if the message changed."""
+        m = self.msg_by_delivery.get(_to_int(delivery_id))
+        if m is None or m.status in (MsgStatus.ACKED, MsgStatus.FAILED):
+            return False
+        m.status = MsgStatus.FAILED
+        self.touch_msg(m)
+        return True
+
+    def fail_undelivered(self, msg: ChatMsg) -> None:
+        """FAILED for a message that never got a delivery id; nothing will settle it."""
+        if msg.status not in (MsgStatus.ACKED, MsgStatus.FAILED):
+            msg.status = MsgStatus.FAILED
+            self.touch_msg(msg)
+        if self.msg_index.get(msg.id) is msg:
+            del self.msg_index[msg.id]
+
+    def forget_delivery(self, delivery_id: int) -> None:
+        """Drop the lookups for a settled delivery; the chat keeps the message."""
+        m = self.msg_by_delivery.pop(_to_int(delivery_id), None)
+        if m is not None and m.status in (MsgStatus.ACKED, MsgStatus.FAILED):
+            if self.msg_index.get(m.id) is m:
+                del self.msg_index[m.id]
 
     def ack_last_pending_from(self, peer:int, window_sec:float=20.0):
         lst = self.chats.get(peer, [])
         for m in reversed(lst):
             if m.status in (MsgStatus.PENDING, MsgStatus.SENT, MsgStatus.RETRYING):
                 m.status = MsgStatus.ACKED
+                self._touch_chat(peer)
                 return
 
     def set_dm(self, num: Optional[int]):
         self.dm_target = num
         for n in self.nodes.values():
-            n["dm"] = (n["num"] == num) if num is not None else False
+            n.dm = (n.num == num) if num is not None else False
+        self._touch_nodes()
 
-    def upsert_node(self, num: int, short: str, ts: float):
+    def _node(self, num: int, ts: float) -> NodeRecord:
         n = self.nodes.get(num)
         if n is None:
-            n = {"num": num, "short": short, "last": ts, "dm": False, "pos": None, "meta": {}}
-            self.nodes[num] = n
+            n = self.nodes[num] = NodeRecord(num, f"{num:x}", ts, self.dm_target == num)
+        return n
+
+    def upsert_node(self, num: int, short: str, ts: float,
+                    snr: float | None = None, hops: int | None = None):
+        n = self.nodes.get(num)
+        if n is None:
+            n = self.nodes[num] = NodeRecord(num, short, ts)
         else:
-            n["short"] = short or n["short"]
-            n["last"] = max(ts, n.get("last", 0))
-        n["dm"] = (self.dm_target == num)
+            n.short = short or n.short
+            if ts > n.last:
+                n.last = ts
+        if snr is not None:
+            n.snr = snr
+        if hops is not None:
+            n.hops = hops
+        n.dm = (self.dm_target == num)
+        self._reindex(n)
+        self._touch_nodes()
 
     def set_position(self, num: int, lat: float, lon: float, alt: float | None = None, ts: float | None = None):
-        n = self.nodes.get(num)
-        if not n:
-            n = {"num": num, "short": f"{num:x}", "last": ts or time.time(), "dm": False, "pos": None, "meta": {}}
-            self.nodes[num] = n
-        n["pos"] = {"lat": lat, "lon": lon, "alt": alt, "ts": ts or time.time()}
-        n["last"] = max(n.get("last", 0), ts or time.time())
+        ts = ts or time.time()
+        n = self._node(num, ts)
+        p = n.pos
+        if p is None:
+            n.pos = GeoPos(lat, lon, alt, ts)
+        else:
+            p.lat, p.lon, p.alt, p.ts = lat, lon, alt, ts
+        self.spatial.update_latlon(num, lat, lon)
+        if ts > n.last:
+            n.last = ts
+        self._reindex(n)
+        self._touch_positions()
 
     def set_msg_meta(self, src: int | None, dst: int | None, encrypted: bool, channel: int | None,
                      hop_limit: int | None, rx_time: float | None, msg_id: str | None):
         if src is None:
             return
-        n = self.nodes.get(src)
-        if not n:
-            n = {"num": src, "short": f"{src:x}", "last": rx_time or time.time(), "dm": False, "pos": None, "meta": {}}
-            self.nodes[src] = n
-        n["meta"] = {
-            "encrypted": bool(encrypted),
-            "channel": channel,
-            "hop": hop_limit,
-            "rx": rx_time or time.time(),
-            "last_msg_id": msg_id,
-        }
-        n["last"] = max(n.get("last", 0), rx_time or time.time())
+        rx = rx_time or time.time()
+        n = self._node(src, rx)
+        m = n.meta
+        if m is None:
+            n.meta = NodeMeta(bool(encrypted), channel, hop_limit, rx, msg_id)
+        else:
+            m.encrypted, m.channel, m.hop, m.rx, m.last_msg_id = bool(encrypted), channel, hop_limit, rx, msg_id
+        if rx > n.last:
+            n.last = rx
+        self._reindex(n)
+        self._touch_nodes()
 
     def set_channels(self, items: List[Tuple[int, str]]):
         self.channels = list(sorted(items, key=lambda x: x[0]))
+        self.ver_channels += 1
+        self.version += 1
 
     def set_active_channels(self, enabled: List[int]):
         self.active_channels = set(enabled)
-
-    def ordered_nodes(self):
-        return sorted(self.nodes.values(), key=lambda n: (-n.get("last", 0), n.get("short", "")))
\ No newline at end of file
+        self.ver_channels += 1
+        self.version += 1
+
+    def ordered_nodes(self, by: str = "recent") -> NodeIndex:
+        """Nodes in ``by`` order ("recent", "name", "snr" or "hops").
+
+        Returns a live, list-like index that is updated node by node as the
+        state changes; secondary orders are built on first request and kept
+        up to date from then on.
+        """
+        idx = self._orders.get(by)
+        if idx is None:
+            if by not in ORDERINGS:
+                raise ValueError(f"unknown node ordering: {by!r}")
+            idx = self._orders[by] = NodeIndex(ORDERINGS[by], self.nodes)
+        return idx
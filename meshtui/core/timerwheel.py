@@ -0,0 +1,71 @@
+# meshtui/core/timerwheel.py
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+Callback = Callable[[Hashable], Any]
+
+
+class TimerWheel:
+    """Hashed timing wheel: one timer per key, coarse resolution.
+
+    A timer due at tick ``t`` lives in slot ``t % slots``; advancing the
+    wheel only visits the slots of the ticks that passed, so the cost per
+    tick is the number of timers sharing those slots, not the total.
+    Timers further out than one rotation simply stay in their slot until
+    their tick comes round. Scheduling a key that already has a timer
+    replaces it. Not thread-safe: use it from the loop thread.
+    """
+
+    def __init__(self, slots: int = 64, resolution: float = 1.0, now: float = 0.0):
+        self.resolution = resolution
+        self._slots: List[Dict[Hashable, Tuple[int, float, Callback]]] = [{} for _ in range(max(1, slots))]
+        self._where: Dict[Hashable, int] = {}
+        self._tick = int(now // resolution)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        i = self._where.get(key)
+        return None if i is None else self._slots[i][key][1]
+
+    def schedule(self, key: Hashable, deadline: float, fn: Callback) -> None:
+        """Call ``fn(key)`` once the wheel is advanced past ``deadline``."""
+        self.cancel(key)
+        # round up: a timer never fires early, at most one resolution late
+        tick = max(int(-(-deadline // self.resolution)), self._tick + 1)
+        i = tick % len(self._slots)
+        self._slots[i][key] = (tick, deadline, fn)
+        self._where[key] = i
+
+    def cancel(self, key: Hashable) -> bool:
+        i = self._where.pop(key, None)
+        if i is None:
+            return False
+        del self._slots[i][key]
+        return True
+
+    def advance(self, now: float) -> int:
+        """Fire every timer whose tick has passed; returns how many fired."""
+        target = int(now // self.resolution)
+        if target <= self._tick:
+            return 0
+        n = len(self._slots)
+        span = target - self._tick
+        slots = range(n) if span >= n else ((self._tick + k) % n for k in range(1, span + 1))
+        due: List[Tuple[float, Hashable, Callback]] = []
+        for i in slots:
+            slot = self._slots[i]
+            expired = [k for k, (tick, _d, _f) in slot.items() if tick <= target]
+            for k in expired:
+                _tick, d, fn = slot.pop(k)
+                del self._where[k]
+                due.append((d, k, fn))
+        self._tick = target
+        # callbacks may schedule again; the wheel is already consistent here
+        due.sort(key=lambda item: item[0])
+        for _d, k, fn in due:
+            fn(k)
+        return len(due)
@@ -0,0 +1,160 @@
+# meshtui/daemon.py
+"""Headless mode: radio + MQTT + reducer without prompt_toolkit.
+
+Nothing under ``meshtui.ui_ptk`` (nor ``meshtui.themes``) is imported here, so
+this runs on boxes without a terminal. Every applied event and a periodic
+state summary are written as JSON lines to stdout or a file.
+"""
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from dataclasses import asdict, is_dataclass
+from typing import Any, Optional, TextIO
+
+from meshtui.core.state import AppState
+from meshtui.core.bus import Bus
+from meshtui.core.config import Config, apply_to_state
+from meshtui.core.reducer import apply_event
+from meshtui.core.events_ext import ConnectionFailed
+from meshtui.core.meshtastic_io import MeshtasticIO
+from meshtui.core.mqtt_ptk import MQTTClient
+from meshtui.core.journal import JournalWriter
+
+RECONNECT_DELAY = 10.0
+
+
+def _event_record(ev: Any) -> dict:
+    rec = {"ts": round(time.time(), 3), "type": type(ev).__name__}
+    if is_dataclass(ev):
+        rec.update(asdict(ev))
+    return rec
+
+
+def _state_record(state: AppState, bus: Bus) -> dict:
+    snap = bus.snapshot()
+    return {
+        "ts": round(time.time(), 3),
+        "type": "state",
+        "nodes": len(state.nodes),
+        "positioned": sum(1 for n in state.nodes.values() if n.pos is not None),
+        "chats": {str(k): len(v) for k, v in state.chats.items()},
+        "last_rx": state.last_rx_time,
+        "bus": {k: snap[k] for k in ("depth", "high_water", "events", "batches")},
+        "dropped": snap["dropped"],
+        "coalesced": snap["coalesced"],
+    }
+
+
+class _LineSink:
+    def __init__(self, out: TextIO):
+        self.out = out
+
+    def write(self, rec: dict) -> None:
+        try:
+            self.out.write(json.dumps(rec, default=str, ensure_ascii=False) + "\n")
+        except (BrokenPipeError, ValueError):
+            # reader went away or the file was closed; keep running regardless
+            pass
+
+    def flush(self) -> None:
+        try:
+            self.out.flush()
+        except (OSError, ValueError):
+            pass
+
+
+async def run(cfg: Optional[Config] = None, port: Optional[str] = None, out: Optional[TextIO] = None,
+              state_interval: float = 30.0, log_events: bool = True, io_factory=None) -> None:
+    loop = asyncio.get_running_loop()
+    if cfg is None:
+        try:
+            cfg = Config.load()
+        except Exception:
+            cfg = Config()
+    sink = _LineSink(out or sys.stdout)
+
+    state = AppState()
+    state.deliveries.attach(loop)
+    apply_to_state(cfg, state)
+    bus = Bus()
+    journal = None
+    if getattr(cfg, "journal_path", None):
+        try:
+            journal = JournalWriter(os.path.expanduser(cfg.journal_path))
+            journal.follow(bus)
+        except Exception as e:
+            state.add_log(f"[journal] disabled: {e!r}")
+
+    iface = (io_factory or MeshtasticIO)(bus, loop, state, cfg)
+    mqtt = MQTTClient(bus, loop, state, cfg)
+    stop = asyncio.Event()
+
+    if not sys.platform.startswith("win"):
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    async def consume():
+        max_batch = int(getattr(cfg, "bus_max_batch", 256) or 1)
+        max_latency = max(0, int(getattr(cfg, "bus_max_latency_ms", 20))) / 1000.0
+        observe, clock = bus.metrics.observe, time.perf_counter
+        async for batch in bus.listen_batches(max_batch=max_batch, max_latency=max_latency, stamped=True):
+            for enq_ts, ev in batch:
+                t0 = clock()
+                try:
+                    apply_event(state, ev)
+                except Exception as e:
+                    sink.write({"ts": round(time.time(), 3), "type": "error", "where": "reducer", "error": repr(e)})
+                observe(type(ev).__name__, t0 - enq_ts, clock() - t0)
+                if log_events:
+                    sink.write(_event_record(ev))
+                if isinstance(ev, ConnectionFailed):
+                    loop.call_later(RECONNECT_DELAY, iface.start, ev.port)
+            sink.flush()
+
+    async def report():
+        while True:
+            await asyncio.sleep(state_interval)
+            sink.write(_state_record(state, bus))
+            sink.flush()
+
+    start_port = port or getattr(cfg, "last_port", None)
+    if start_port:
+        iface.start(port=start_port)
+    else:
+        sink.write({"ts": round(time.time(), 3), "type": "error", "where": "startup",
+                    "error": "no port configured; pass --port or run the TUI setup once"})
+    if getattr(cfg, "mqtt_enabled", False):
+        mqtt.connect(
+            host=getattr(cfg, "mqtt_host", "localhost"),
+            port=int(getattr(cfg, "mqtt_port", 1883)),
+            tls=bool(getattr(cfg, "mqtt_tls", False)),
+        )
+
+    tasks = [asyncio.create_task(consume())]
+    if state_interval > 0:
+        tasks.append(asyncio.create_task(report()))
+    try:
+        await stop.wait()
+    finally:
+        for fn in (iface.stop, mqtt.disconnect):
+            try:
+                fn()
+            except Exception:
+                pass
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await state.deliveries.aclose()
+        sink.write(_state_record(state, bus))
+        sink.flush()
+        if journal is not None:
+            try:
+                journal.close()
+            except Exception:
+                pass
@@ -1,16 +1,19 @@
 # meshtui/main.py
-import asyncio, sys
+import asyncio, os, sys, time
 from prompt_toolkit.patch_stdout import patch_stdout
 
 from meshtui.core.state import AppState
 from meshtui.core.bus import Bus
 from meshtui.core.config import Config, apply_to_state
+from meshtui.core.configstore import ConfigStore
 from meshtui.core.reducer import apply_event
 from meshtui.core.events_ext import ConnectionFailed
 from meshtui.ui_ptk.layout import build_layout
 from meshtui.ui_ptk import dialogs
 from meshtui.core.meshtastic_io import MeshtasticIO
 from meshtui.core.mqtt_ptk import MQTTClient
+from meshtui.core.journal import JournalWriter
+from meshtui.core.basemap import Basemap
 
 try:
     from meshtui.core.actions import build_actions
@@ -20,13 +23,24 @@ except Exception:
         return _A()
 
 async def bus_listener(state, bus, app, iface, cfg):
+    max_batch = int(getattr(cfg, "bus_max_batch", 256) or 1)
+    max_latency = max(0, int(getattr(cfg, "bus_max_latency_ms", 20))) / 1000.0
+    observe = bus.metrics.observe
+    clock = time.perf_counter
     try:
-        async for ev in bus.listen():
-            try:
-                apply_event(state, ev)
-            except Exception as e:
-                state.add_log(f"[reducer] error: {e!r}")
-            if isinstance(ev, ConnectionFailed):
+        async for batch in bus.listen_batches(max_batch=max_batch, max_latency=max_latency, stamped=True):
+            failures = []
+            for enq_ts, ev in batch:
+                t0 = clock()
+                try:
+                    apply_event(state, ev)
+                except Exception as e:
+                    state.add_log(f"[reducer] error: {e!r}")
+                observe(type(ev).__name__, t0 - enq_ts, clock() - t0)
+                if isinstance(ev, ConnectionFailed):
+                    failures.append(ev)
+            app.invalidate()
+            for ev in failures:
                 if getattr(state, "in_wizard", False):
                     state.add_log(f"[connect] error during wizard: {ev.port} -> {ev.error}")
                 else:
@@ -34,12 +48,11 @@ async def bus_listener(state, bus, app, iface, cfg):
                         await dialogs.show_connection_error_dialog(app, iface, cfg, ev.port, ev.error)
                     except Exception as e:
                         state.add_log(f"[dialog] error: {e!r}")
-            app.invalidate()
+                app.invalidate()
     except asyncio.CancelledError:
         return
 
-
-async def main():
+async def main(io_factory=None, port=None):
     if sys.platform.startswith("win"):
         try:
             asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())  # type: ignore[attr-defined]
@@ -52,12 +65,29 @@ async def main():
         cfg = Config.load()
     except Exception:
         cfg = Config()
+    store = ConfigStore(cfg, loop=loop)
     state = AppState()
+    state.deliveries.attach(loop)
     apply_to_state(cfg, state)
     bus = Bus()
 
+    journal = None
+    if getattr(cfg, "journal_path", None):
+        try:
+            journal = JournalWriter(os.path.expanduser(cfg.journal_path))
+            journal.follow(bus)
+        except Exception as e:
+            state.add_log(f"[journal] disabled: {e!r}")
+
+    basemap = None
+    if getattr(cfg, "basemap_path", None):
+        try:
+            basemap = Basemap(os.path.expanduser(cfg.basemap_path))
+        except (OSError, ValueError) as e:
+            state.add_log(f"Basemap unavailable: {e}")
+
     # Constructors that match your real signatures
-    iface = MeshtasticIO(bus, loop, state, cfg)
+    iface = (io_factory or MeshtasticIO)(bus, loop, state, cfg)
     mqtt = MQTTClient(bus, loop, state, cfg)
 
     actions = build_actions(state=state, bus=bus, iface=iface, cfg=cfg)
@@ -68,19 +98,21 @@ async def main():
         bus=bus,
         initial_theme=getattr(cfg, "theme", None),
         cfg=cfg,
+        basemap=basemap,
     )
 
     async def _startup():
         try:
-            if not getattr(cfg, "last_port", None):
+            if not port and not getattr(cfg, "last_port", None):
                 await dialogs.setup_wizard(app, state, iface, cfg)
-            if getattr(cfg, "last_port", None):
+            start_port = port or getattr(cfg, "last_port", None)
+            if start_port:
                 try:
-                    iface.start(port=cfg.last_port)
-                    state.add_log(f"[serial] connecting {cfg.last_port}")
+                    iface.start(port=start_port)
+                    state.add_log(f"[serial] connecting {start_port}")
                 except Exception as e:
                     state.add_log(f"[serial] start error: {e!r}")
-                    await dialogs.show_connection_error_dialog(app, iface, cfg, cfg.last_port, e)
+                    await dialogs.show_connection_error_dialog(app, iface, cfg, start_port, e)
             if getattr(cfg, "mqtt_enabled", False):
                 try:
                     mqtt.connect(
@@ -119,6 +151,18 @@ async def main():
         if not listener_task.done():
             listener_task.cancel()
         await asyncio.gather(listener_task, return_exceptions=True)
+        await state.deliveries.aclose()
+        try:
+            await store.aclose()
+        except Exception:
+            pass
+        if journal is not None:
+            try:
+                journal.close()
+            except Exception:
+                pass
+        if basemap is not None:
+            basemap.close()
 
 if __name__ == "__main__":
     try:
@@ -6,10 +6,12 @@ from typing import Any, Dict, Optional
 try:
     from meshtui.core.meshtastic_io import MeshtasticIO, BROADCAST
     from meshtui.core.ack_registry import ack_registry
+    from meshtui.core.delivery import GRACE
 except ModuleNotFoundError:
     # Fallback relative imports if package layout differs
     from .core.meshtastic_io import MeshtasticIO, BROADCAST  # type: ignore
     from .core.ack_registry import ack_registry  # type: ignore
+    from .core.delivery import GRACE  # type: ignore
 
 class MsgStatus:
     QUEUED = "QUEUED"
@@ -53,36 +55,50 @@ async def send_with_ack(
     if portNum is not None:
         kwargs["portNum"] = int(portNum)
 
-    pkt = await loop.run_in_executor(None, lambda: io.sendText(text=text, **kwargs))
+    try:
+        pkt = await loop.run_in_executor(None, lambda: io.sendText(text=text, **kwargs))
+    except Exception:
+        if msg is not None and hasattr(state, "fail_undelivered"):
+            state.fail_undelivered(msg)
+        raise
     tx_id = _extract_tx_id(pkt)
     if isinstance(tx_id, int):
         ack_registry.register(tx_id)
         # optional: bind into your UI/state if method exists
         if hasattr(state, "bind_delivery_ids") and msg is not None:
             state.bind_delivery_ids(msg, tx_id)
+    elif msg is not None and hasattr(state, "fail_undelivered"):
+        # no packet id: no ACK can ever be matched to it
+        state.fail_undelivered(msg)
 
     if hasattr(state, "set_current_status"):
         state.set_current_status(MsgStatus.SENT)
 
     result = None
     if isinstance(tx_id, int):
-        result = await loop.run_in_executor(None, lambda: ack_registry.wait_for(tx_id, timeout_s))
+        tracker = getattr(state, "deliveries", None)
+        if tracker is not None:
+            # the tracker's wheel expires it (-> FAILED); our own timer is a backstop
+            tracker.track(tx_id, timeout_s)
+            result = await ack_registry.wait(tx_id, timeout_s + GRACE)
+        else:
+            result = await ack_registry.wait(tx_id, timeout_s)
 
     if not result:
         # timeout path
-        if hasattr(state, "mark_timeout"):
-            state.mark_timeout(tx_id)
+        if hasattr(state, "mark_failed") and isinstance(tx_id, int):
+            state.mark_failed(tx_id)
         return {"status": MsgStatus.TIMEOUT, "tx_id": tx_id, "from": None}
 
     st = result.get("state")
     origin = result.get("from")
     if st == "ACK":
         if hasattr(state, "mark_acked"):
-            state.mark_acked(tx_id, origin)
+            state.mark_acked(tx_id)
         return {"status": MsgStatus.ACK, "tx_id": tx_id, "from": origin}
     if st == "NAK":
-        if hasattr(state, "mark_nacked"):
-            state.mark_nacked(tx_id, origin)
+        if hasattr(state, "mark_failed"):
+            state.mark_failed(tx_id)
         return {"status": MsgStatus.NAK, "tx_id": tx_id, "from": origin}
 
     return {"status": MsgStatus.TIMEOUT, "tx_id": tx_id, "from": None}
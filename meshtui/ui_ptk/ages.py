@@ -0,0 +1,66 @@
+# meshtui/ui_ptk/ages.py
+from heapq import heappop, heappush
+from typing import Dict, List, Set, Tuple
+
+from meshtui.core.clock import CoarseClock
+
+_UNITS = (("s", 1, 60), ("m", 60, 3600), ("h", 3600, 86400), ("d", 86400, 604800))
+_WEEK = 604800
+
+
+def age_label(seconds: float) -> Tuple[str, int]:
+    """Label for an age plus the age (in whole seconds) at which it changes."""
+    age = max(0, int(seconds))
+    for unit, size, limit in _UNITS:
+        if age < limit:
+            return f"{age // size}{unit}", (age // size + 1) * size
+    return f"{age // _WEEK}w", (age // _WEEK + 1) * _WEEK
+
+
+def format_age(seconds: float) -> str:
+    return age_label(seconds)[0]
+
+
+class AgeLabels:
+    """Per-node "last heard" labels that only change at bucket boundaries.
+
+    A label is computed once against ``clock.now`` and a min-heap remembers
+    when it next changes: every second while under a minute, then on the
+    minute, hour, day and week. :meth:`advance` (called from the clock tick)
+    pops the labels that expired and bumps ``version`` only if one of them
+    was actually drawn since the last bump, so a node list scrolled far away
+    from the changing rows does not cause a redraw.
+    """
+
+    def __init__(self, clock: CoarseClock):
+        self.clock = clock
+        self.version = 0
+        self._cache: Dict[int, Tuple[float, str]] = {}
+        self._heap: List[Tuple[float, int, float]] = []
+        self._shown: Set[int] = set()
+
+    def label(self, num: int, last: float) -> str:
+        self._shown.add(num)
+        hit = self._cache.get(num)
+        if hit is not None and hit[0] == last:
+            return hit[1]
+        text, change_at = age_label(self.clock.now - last)
+        self._cache[num] = (last, text)
+        heappush(self._heap, (last + change_at, num, last))
+        return text
+
+    def advance(self, now: float) -> bool:
+        heap, cache = self._heap, self._cache
+        changed = False
+        while heap and heap[0][0] <= now:
+            _, num, last = heappop(heap)
+            hit = cache.get(num)
+            if hit is None or hit[0] != last:
+                continue  # node was heard again; a newer entry is queued
+            del cache[num]
+            if num in self._shown:
+                changed = True
+        if changed:
+            self.version += 1
+            self._shown.clear()
+        return changed
@@ -0,0 +1,119 @@
+# meshtui/ui_ptk/braille.py
+from typing import List, Tuple
+
+from prompt_toolkit.formatted_text import StyleAndTextTuples
+
+# dot bit for (x & 1, y & 3) inside a 2x4 braille cell, indexed [y][x]
+BITS = ((0x01, 0x08), (0x02, 0x10), (0x04, 0x20), (0x40, 0x80))
+# same bits flattened, indexed [(y & 3) << 1 | (x & 1)]
+FLAT_BITS = tuple(b for row in BITS for b in row)
+GLYPHS = [" "] + [chr(0x2800 + m) for m in range(1, 256)]
+
+
+class BrailleCanvas:
+    """``cols`` x ``rows`` terminal cells addressed as a ``2*cols`` x ``4*rows``
+    dot grid.
+
+    Each layer is a bytearray with one braille bitmask per cell, stacked
+    bottom to top; a cell shows the topmost layer that has any dot there,
+    in that layer's style. ``counts`` holds how many points landed in each
+    cell; cells with more than one are drawn as a count glyph instead.
+    """
+
+    __slots__ = ("cols", "rows", "w", "h", "counts", "_layers")
+
+    def __init__(self, cols: int, rows: int):
+        self.cols = cols
+        self.rows = rows
+        self.w = cols * 2
+        self.h = rows * 4
+        self.counts = bytearray(cols * rows)
+        self._layers: List[Tuple[str, bytearray]] = []
+
+    def layer(self, style: str) -> bytearray:
+        mask = bytearray(self.cols * self.rows)
+        self._layers.append((style, mask))
+        return mask
+
+    def add_layer(self, style: str, mask: bytearray) -> None:
+        """Stack a ready-made mask (e.g. a cached basemap layer) as the next layer."""
+        self._layers.append((style, mask))
+
+    def dot(self, mask: bytearray, x: int, y: int) -> None:
+        if 0 <= x < self.w and 0 <= y < self.h:
+            mask[(y >> 2) * self.cols + (x >> 1)] |= BITS[y & 3][x & 1]
+
+    def hline(self, mask: bytearray, y: int, step: int = 2) -> None:
+        if 0 <= y < self.h:
+            base = (y >> 2) * self.cols
+            row_bits = BITS[y & 3]
+            for x in range(0, self.w, step):
+                mask[base + (x >> 1)] |= row_bits[x & 1]
+
+    def vline(self, mask: bytearray, x: int, step: int = 2) -> None:
+        if 0 <= x < self.w:
+            c, col = x >> 1, x & 1
+            cols = self.cols
+            for y in range(0, self.h, step):
+                mask[(y >> 2) * cols + c] |= BITS[y & 3][col]
+
+    def render(self, cluster_style: str = "") -> List[StyleAndTextTuples]:
+        cols, rows = self.cols, self.rows
+        n = cols * rows
+        layers = self._layers[::-1]
+        counts = self.counts
+        glyphs = GLYPHS
+        # OR every layer together at C speed to find the cells that are not
+        # blank; only those are looked at one by one
+        acc = int.from_bytes(counts, "little")
+        for _st, mask in layers:
+            acc |= int.from_bytes(mask, "little")
+        used = acc.to_bytes(n, "little")
+        lines: List[StyleAndTextTuples] = [[] for _ in range(rows)]
+        row_end = cols
+        r = 0
+        col = 0          # next column not yet emitted in row r
+        frags = lines[0]
+        run: List[str] = []
+        run_style = ""
+        for i in [i for i, v in enumerate(used) if v]:
+            while i >= row_end:
+                if run:
+                    frags.append((run_style, "".join(run)))
+                    run = []
+                if col < cols:
+                    frags.append(("", " " * (cols - col)))
+                r += 1
+                row_end += cols
+                col = 0
+                frags = lines[r]
+            c = i - (row_end - cols)
+            if c > col:
+                if run:
+                    frags.append((run_style, "".join(run)))
+                    run = []
+                frags.append(("", " " * (c - col)))
+                run_style = ""
+            k = counts[i]
+            if k > 1:
+                style, ch = cluster_style, (str(k) if k < 10 else "+")
+            else:
+                style, ch = "", " "
+                for st, mask in layers:
+                    m = mask[i]
+                    if m:
+                        style, ch = st, glyphs[m]
+                        break
+            if style != run_style and run:
+                frags.append((run_style, "".join(run)))
+                run = []
+            run_style = style
+            run.append(ch)
+            col = c + 1
+        if run:
+            frags.append((run_style, "".join(run)))
+        if col < cols:
+            frags.append(("", " " * (cols - col)))
+        for line in lines[r + 1:]:
+            line.append(("", " " * cols))
+        return lines
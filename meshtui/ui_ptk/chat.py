@@ -0,0 +1,125 @@
+# meshtui/ui_ptk/chat.py
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from prompt_toolkit.data_structures import Point
+from prompt_toolkit.formatted_text import StyleAndTextTuples
+from prompt_toolkit.layout.controls import UIContent
+
+from meshtui.model import STATUS_SYMBOL, ChatMsg, MsgStatus
+from meshtui.ui_ptk.controls import TailFollowControl, wrap_text
+
+STATUS_STYLE: Dict[MsgStatus, str] = {
+    MsgStatus.PENDING: "class:msg.pending",
+    MsgStatus.SENT: "class:msg.sent",
+    MsgStatus.RETRYING: "class:msg.retry",
+    MsgStatus.ACKED: "class:msg.acked",
+    MsgStatus.FAILED: "class:msg.failed",
+}
+
+INDENT = 2  # status symbol + space; continuation lines hang under the text
+
+
+class ChatControl(TailFollowControl):
+    """Conversation view that formats only the wrapped lines on screen.
+
+    Each message is wrapped once per width and its fragments are cached under
+    (id, status, width), so an ACK re-renders just that message; the cache
+    holds the open conversation only. Line offsets are kept as absolute
+    prefix sums keyed by the history's sequence numbers (each conversation
+    is a RingBuffer): new messages are appended, trimmed ones dropped from
+    the front. ``get_line`` bisects them to find the message for a screen row.
+    The view follows the newest message until the user scrolls up, and
+    re-pins once they scroll back to the bottom.
+    """
+
+    def __init__(self, state):
+        super().__init__()
+        self.state = state
+        self._rendered: Dict[int, Tuple[MsgStatus, int, List[StyleAndTextTuples]]] = {}
+        self._conv: Optional[int] = None
+        self._width = 0
+        self._msgs = []
+        self._seq0 = 0        # history sequence number of _starts[0]
+        self._starts: List[int] = []
+        self._end = 0         # absolute line number after the last message
+        self._key = None
+        self._content: Optional[UIContent] = None
+
+    def is_focusable(self) -> bool:
+        return False
+
+    # -------- per-message cache --------
+    def _lines_of(self, m: ChatMsg, width: int) -> List[StyleAndTextTuples]:
+        hit = self._rendered.get(m.id)
+        if hit is not None and hit[0] is m.status and hit[1] == width:
+            return hit[2]
+        parts = wrap_text(m.text, width - INDENT)
+        pad = " " * INDENT
+        lines: List[StyleAndTextTuples] = [
+            [(STATUS_STYLE.get(m.status, ""), f"{STATUS_SYMBOL.get(m.status, '?')} "), ("class:msg.body", parts[0])]
+        ]
+        lines.extend([("", pad), ("class:msg.body", p)] for p in parts[1:])
+        self._rendered[m.id] = (m.status, width, lines)
+        return lines
+
+    # -------- offsets --------
+    def _sync(self, to: int, width: int) -> None:
+        msgs = self.state.chats.get(to)
+        first, stop = (msgs.first_seq, msgs.appended) if msgs is not None else (0, 0)
+        if to != self._conv or width != self._width:
+            # only the open conversation is cached
+            self._rendered.clear()
+            self._conv, self._width = to, width
+            self._seq0, self._starts, self._end = first, [], 0
+        elif self._seq0 + len(self._starts) < first:
+            self._seq0, self._starts, self._end = first, [], 0
+        elif self._seq0 < first:
+            # history trimmed at the head: drop its offsets, keep the rest
+            gone = first - self._seq0
+            starts = self._starts
+            shift = (starts[gone] if gone < len(starts) else self._end) - starts[0]
+            if not self._pinned:
+                self._cursor = max(0, self._cursor - shift)
+            del starts[:gone]
+            self._seq0 = first
+            if len(self._rendered) > 2 * len(msgs):
+                live = {m.id for m in msgs}
+                self._rendered = {k: v for k, v in self._rendered.items() if k in live}
+        self._msgs = msgs if msgs is not None else []
+        starts, end = self._starts, self._end
+        for seq in range(self._seq0 + len(starts), stop):
+            starts.append(end)
+            end += len(self._lines_of(msgs[seq - first], width))
+        self._end = end
+        self._total = end - starts[0] if starts else 0
+
+    def create_content(self, width: int, height: Optional[int]) -> UIContent:
+        state = self.state
+        to = state.dm_target if state.dm_target is not None else -1
+        if to != self._conv:
+            self._pinned = True
+        key = (to, state.chat_ver.get(to, 0), width, self._cursor, self._pinned)
+        if self._content is not None and key == self._key:
+            return self._content
+
+        self._sync(to, width)
+        if not self._msgs:
+            self._key = key
+            self._content = UIContent(get_line=lambda i: [("", " (No messages)")], line_count=1, show_cursor=False)
+            return self._content
+
+        total = self._total
+        self._follow()
+        msgs, starts, base, w = self._msgs, self._starts, self._starts[0], width
+
+        def get_line(i: int) -> StyleAndTextTuples:
+            k = bisect_right(starts, base + i) - 1
+            lines = self._lines_of(msgs[k], w)
+            j = base + i - starts[k]
+            return lines[j] if j < len(lines) else []
+
+        self._key = (to, state.chat_ver.get(to, 0), width, self._cursor, self._pinned)
+        self._content = UIContent(get_line=get_line, line_count=total,
+                                  cursor_position=Point(0, self._cursor), show_cursor=False)
+        return self._content
@@ -1,8 +1,108 @@
 # meshtui/ui_ptk/controls.py
 from prompt_toolkit.layout import Window
-from prompt_toolkit.layout.controls import FormattedTextControl
+from prompt_toolkit.layout.controls import FormattedTextControl, UIContent, UIControl
 from prompt_toolkit.application import get_app
 from prompt_toolkit.mouse_events import MouseEventType
+from prompt_toolkit.utils import get_cwidth
+
+
+def wrap_text(text: str, width: int) -> list[str]:
+    """Split ``text`` into screen lines of at most ``width`` cells.
+
+    Hard newlines start a new line; wide (CJK, emoji) characters count as two
+    cells. Pure-ASCII paragraphs take a slicing fast path.
+    """
+    width = max(1, width)
+    out: list[str] = []
+    for para in text.split("\n"):
+        if para.isascii():
+            if len(para) <= width:
+                out.append(para)
+            else:
+                out.extend(para[i:i + width] for i in range(0, len(para), width))
+            continue
+        start = used = 0
+        for i, ch in enumerate(para):
+            cw = get_cwidth(ch)
+            if used + cw > width and i > start:
+                out.append(para[start:i])
+                start, used = i, 0
+            used += cw
+        out.append(para[start:])
+    return out
+
+
+class TailFollowControl(UIControl):
+    """Base for line-virtualized controls that stick to their last line.
+
+    Subclasses keep ``_total`` (line count) current and place the Window via
+    ``_cursor``. Wheel scrolling arrives through ``move_cursor_up/down``;
+    scrolling up detaches from the tail, reaching the last line re-attaches.
+    """
+
+    def __init__(self):
+        self._cursor = 0
+        self._total = 0
+        self._pinned = True
+
+    def _follow(self) -> int:
+        if self._pinned or self._cursor >= self._total:
+            self._cursor = max(0, self._total - 1)
+        return self._cursor
+
+    def move_cursor_up(self) -> None:
+        if self._cursor > 0:
+            self._cursor -= 1
+        self._pinned = False
+
+    def move_cursor_down(self) -> None:
+        self._cursor = min(self._cursor + 1, max(0, self._total - 1))
+        self._pinned = self._cursor >= self._total - 1
+
+
+class CachedFormattedTextControl(FormattedTextControl):
+    """FormattedTextControl that skips rebuilding while ``cache_key()`` is unchanged.
+
+    ``cache_key`` should return something cheap and hashable built from state
+    version counters; together with the width it decides whether the text
+    callable runs at all on this frame.
+    """
+
+    def __init__(self, text, cache_key=None, **kwargs):
+        super().__init__(text=text, **kwargs)
+        self._cache_key = cache_key
+        self._cached_key = None
+        self._cached_content: UIContent | None = None
+        self._width_key = None
+        self._width = 0
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate_cache(self) -> None:
+        self._cached_content = None
+        self._width_key = None
+
+    def preferred_width(self, max_available_width: int) -> int:
+        # VSplit asks every frame; without this the text callable would still run
+        if self._cache_key is None:
+            return super().preferred_width(max_available_width)
+        key = self._cache_key()
+        if self._width_key is None or key != self._width_key:
+            self._width = super().preferred_width(max_available_width)
+            self._width_key = key
+        return self._width
+
+    def create_content(self, width: int, height: int | None) -> UIContent:
+        if self._cache_key is None:
+            return super().create_content(width, height)
+        key = (self._cache_key(), width)
+        if self._cached_content is not None and key == self._cached_key:
+            self.hits += 1
+            return self._cached_content
+        self.misses += 1
+        content = super().create_content(width, height)
+        self._cached_key, self._cached_content = key, content
+        return content
 
 
 class FlatButtonWindow(Window):
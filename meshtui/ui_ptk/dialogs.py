@@ -10,7 +10,7 @@ from prompt_toolkit.layout.containers import HSplit
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.keys import Keys
 
-from meshtui.themes import ThemeManager
+from meshtui.themes import get_style, theme_names
 
 
 def _start_iface(iface, port):
@@ -217,7 +217,7 @@ async def connect_tcp(app, iface, cfg):
         st = getattr(iface, "state", None)
         if st: st.add_log(f"[tcp] connecting {host}")
         cfg.last_port = host
-        cfg.save()
+        cfg.request_save("last_port")
     except Exception as e:
         st = getattr(iface, "state", None)
         if st: st.add_log(f"[tcp] connect error: {e!r}")
@@ -323,7 +323,7 @@ async def connect_port(app, state, iface, cfg):
         state.add_log(f"Connecting to {port}")
         _start_iface(iface, port)
         cfg.last_port = port
-        cfg.save()
+        cfg.request_save("last_port", "baud_rate")
     except Exception as e:
         state.add_log(f"Connect error: {e!r}")
         if not getattr(state, "in_wizard", False):
@@ -381,16 +381,15 @@ async def confirm_reboot(app, state, iface) -> None:
 async def setup_wizard(app, state, iface, cfg) -> None:
     state.in_wizard = True
     try:
-        tm = ThemeManager()
-        names = tm.names()
+        names = theme_names()
 
         theme = await _radio("Meshtui Setup", "Choose a theme:", [(n, n) for n in names])
         if theme is None:
             return
         try:
             cfg.theme = theme
-            app.style = ThemeManager(theme).style
-            cfg.save()
+            app.style = get_style(theme)
+            cfg.request_save("theme")
         except Exception:
             pass
         app.invalidate()
@@ -417,7 +416,7 @@ async def setup_wizard(app, state, iface, cfg) -> None:
             cfg.mqtt_tls = bool(tls)
 
         try:
-            cfg.save()
+            cfg.request_save("mqtt_enabled", "mqtt_host", "mqtt_port", "mqtt_tls")
         except Exception:
             pass
         state.add_log("Setup saved")
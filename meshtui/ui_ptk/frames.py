@@ -0,0 +1,66 @@
+# meshtui/ui_ptk/frames.py
+import asyncio
+from typing import Callable, List, Optional
+
+from prompt_toolkit.application import Application
+
+from meshtui.core.clock import CoarseClock
+
+DEFAULT_MAX_FPS = 30
+DEFAULT_IDLE_REFRESH = 1.0
+
+
+class FrameScheduler:
+    """Decides when the Application redraws.
+
+    Replaces the fixed ``refresh_interval`` poll. Redraws happen only when
+    something calls ``app.invalidate()``; prompt_toolkit already folds
+    repeated invalidations into one pending frame, and ``min_redraw_interval``
+    caps those frames at ``max_fps`` under load.
+
+    While idle the only wake-up is the shared coarse ``clock`` (period
+    ``idle_refresh`` seconds). On each tick the registered watchers say
+    whether anything clock-driven on screen changed, e.g. an age label
+    crossing into the next minute; only then is a frame drawn. With
+    ``idle_refresh`` at 0 the clock still ticks at 1 Hz for readers of
+    ``clock.now`` but never triggers a redraw.
+    """
+
+    def __init__(self, app: Application, max_fps: int = DEFAULT_MAX_FPS,
+                 idle_refresh: float = DEFAULT_IDLE_REFRESH, clock: Optional[CoarseClock] = None):
+        self.app = app
+        self.max_fps = max(0, int(max_fps))
+        self.idle_refresh = max(0.0, float(idle_refresh))
+        self.clock = clock or CoarseClock()
+        self.clock.period = self.idle_refresh or 1.0
+        self.frames = 0
+        self.idle_frames = 0
+        self._watchers: List[Callable[[float], bool]] = []
+        self._task: Optional[asyncio.Task] = None
+
+        app.refresh_interval = None
+        app.min_redraw_interval = 1.0 / self.max_fps if self.max_fps else None
+        app.after_render += self._on_render
+        app.pre_run_callables.append(self._start)
+        self.clock.subscribe(self._on_tick)
+
+    def request(self) -> None:
+        self.app.invalidate()
+
+    def watch(self, changed: Callable[[float], bool]) -> None:
+        """Register ``changed(now) -> bool``, polled on every clock tick."""
+        self._watchers.append(changed)
+
+    def _on_render(self, _app) -> None:
+        self.frames += 1
+
+    def _on_tick(self, now: float) -> None:
+        # evaluate every watcher: they advance their own state as a side effect
+        dirty = [w(now) for w in self._watchers]
+        if self.idle_refresh > 0 and any(dirty):
+            self.idle_frames += 1
+            self.app.invalidate()
+
+    def _start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = self.app.create_background_task(self.clock.run())
@@ -1,25 +1,40 @@
 # meshtui/ui_ptk/layout.py
-from prompt_toolkit.application import Application, get_app
+import os
+import time
+
+from prompt_toolkit.application import Application
 from prompt_toolkit.layout import Layout, HSplit, VSplit
 from prompt_toolkit.layout.dimension import Dimension
-from prompt_toolkit.layout.containers import ConditionalContainer, FloatContainer, Float
+from prompt_toolkit.layout.containers import ConditionalContainer, FloatContainer
 from prompt_toolkit.filters import Condition, has_focus
-from prompt_toolkit.widgets import Label, Frame, TextArea, Box
+from prompt_toolkit.widgets import Label, Frame, TextArea
 from prompt_toolkit.key_binding import KeyBindings, merge_key_bindings
 
-from meshtui.ui_ptk.views import combined_list_view, log_view, chat_view, settings_view
+from meshtui.ui_ptk.views import combined_list_view, log_view, chat_view, settings_view, diagnostics_view
 from meshtui.ui_ptk.bind import build_keybindings
 from meshtui.ui_ptk.status import status_view
 from meshtui.ui_ptk.map import build_map
-from meshtui.ui_ptk.widgets import v_splitter, h_splitter
 from meshtui.ui_ptk.controls import FlatButtonWindow
+from meshtui.ui_ptk.frames import FrameScheduler, DEFAULT_MAX_FPS, DEFAULT_IDLE_REFRESH
+from meshtui.ui_ptk.ages import AgeLabels
+from meshtui.ui_ptk.profiling import ViewProfiler
+from meshtui.core.clock import CoarseClock
 from meshtui.themes import ThemeManager
 
 
-def build_layout(state, actions, iface, bus, initial_theme: str | None = None, cfg=None):
+def build_layout(state, actions, iface, bus, initial_theme: str | None = None, cfg=None, basemap=None):
     theme = ThemeManager(initial_theme)
 
-    bottom_tab = {"v": (cfg.last_tab if cfg and cfg.last_tab in ("Log", "Map", "Settings") else "Log")}
+    bottom_tab = {"v": (cfg.last_tab if cfg and cfg.last_tab in ("Log", "Map", "Settings", "Diag") else "Log")}
+
+    def set_tab(name: str) -> None:
+        bottom_tab["v"] = name
+        if cfg and cfg.last_tab != name:
+            cfg.last_tab = name
+            try:
+                cfg.request_save("last_tab")
+            except Exception:
+                pass
 
     input_box = TextArea(height=1, prompt="> ", multiline=False, style="class:text-area")
     main_kb = build_keybindings(state, actions, iface, bus, input_box)
@@ -27,24 +42,30 @@ def build_layout(state, actions, iface, bus, initial_theme: str | None = None, c
     def on_pick_dm(num: int):
         state.set_dm(num)
 
-    nodes_window = combined_list_view(state, iface, on_pick=on_pick_dm)
+    clock = CoarseClock()
+    ages = AgeLabels(clock)
+    nodes_window = combined_list_view(state, iface, on_pick=on_pick_dm, ages=ages)
     nodes_frame = Frame(nodes_window, title="Nodes & Channels", style='class:frame')
     focused_nodes_frame = Frame(nodes_window, title="Nodes & Channels", style='class:frame.focused')
 
     scroll_kb = KeyBindings()
     is_nodes_window_focused = has_focus(nodes_window)
 
-    def _clamp(v):
-        return max(0, int(v))
+    nodes_control = nodes_window.content
 
     @scroll_kb.add("up", filter=is_nodes_window_focused)
     def _(event):
-        nodes_window.vertical_scroll = _clamp(nodes_window.vertical_scroll - 1)
+        nodes_control.move_cursor_up()
         event.app.invalidate()
 
     @scroll_kb.add("down", filter=is_nodes_window_focused)
     def _(event):
-        nodes_window.vertical_scroll = _clamp(nodes_window.vertical_scroll + 1)
+        nodes_control.move_cursor_down()
+        event.app.invalidate()
+
+    @scroll_kb.add("enter", filter=is_nodes_window_focused)
+    def _(event):
+        nodes_control.pick_cursor()
         event.app.invalidate()
 
     @main_kb.add("tab")
@@ -55,14 +76,19 @@ def build_layout(state, actions, iface, bus, initial_theme: str | None = None, c
     def _(event):
         event.app.layout.focus_previous()
 
-    log_frame = Frame(log_view(state), title="Log", style="class:frame")
-    map_frame = Frame(build_map(state), title="Map", style="class:frame")
+    log_window = log_view(state)
+    log_frame = Frame(log_window, title="Log", style="class:frame")
+    map_window = build_map(state, basemap)
+    map_frame = Frame(map_window, title="Map", style="class:frame")
     settings_frame = Frame(settings_view(state, iface, cfg), title="Settings", style="class:frame")
+    diag_window = diagnostics_view(bus)
+    diag_frame = Frame(diag_window, title="Diagnostics", style="class:frame")
 
     tabs_bar = VSplit([
-        FlatButtonWindow("Log", lambda: bottom_tab.__setitem__("v", "Log")),
-        FlatButtonWindow("Map", lambda: bottom_tab.__setitem__("v", "Map")),
-        FlatButtonWindow("Settings", lambda: bottom_tab.__setitem__("v", "Settings")),
+        FlatButtonWindow("Log", lambda: set_tab("Log")),
+        FlatButtonWindow("Map", lambda: set_tab("Map")),
+        FlatButtonWindow("Settings", lambda: set_tab("Settings")),
+        FlatButtonWindow("Diag", lambda: set_tab("Diag")),
     ], padding=1, height=1)
 
     bottom_stack = HSplit([
@@ -70,6 +96,7 @@ def build_layout(state, actions, iface, bus, initial_theme: str | None = None, c
         ConditionalContainer(log_frame, filter=Condition(lambda: bottom_tab["v"] == "Log")),
         ConditionalContainer(map_frame, filter=Condition(lambda: bottom_tab["v"] == "Map")),
         ConditionalContainer(settings_frame, filter=Condition(lambda: bottom_tab["v"] == "Settings")),
+        ConditionalContainer(diag_frame, filter=Condition(lambda: bottom_tab["v"] == "Diag")),
     ])
 
     left_column = HSplit([
@@ -81,7 +108,8 @@ def build_layout(state, actions, iface, bus, initial_theme: str | None = None, c
     nodes_frame.height = Dimension(weight=0.6, min=6)
     focused_nodes_frame.height = Dimension(weight=0.6, min=6)
 
-    chat_frame = Frame(chat_view(state), title="Chat", style="class:frame")
+    chat_window = chat_view(state)
+    chat_frame = Frame(chat_window, title="Chat", style="class:frame")
     header = Label("Meshtastic TUI", style="class:header")
     status = status_view(state, theme_name_provider=lambda: theme.name)
 
@@ -106,6 +134,14 @@ def build_layout(state, actions, iface, bus, initial_theme: str | None = None, c
         modal=False,
     )
 
+    profiler = ViewProfiler()
+    for name, window in (("nodes", nodes_window), ("chat", chat_window), ("log", log_window),
+                         ("map", map_window), ("diag", diag_window), ("status", status)):
+        profiler.register(name, window.content)
+    if cfg and cfg.ui_profile:
+        profiler.enable(pin=True)
+    root_container.floats.append(profiler.overlay())
+
     merged_kb = merge_key_bindings([main_kb, scroll_kb])
 
     app = Application(
@@ -114,8 +150,45 @@ def build_layout(state, actions, iface, bus, initial_theme: str | None = None, c
         mouse_support=True,
         full_screen=True,
         style=theme.style,
-        refresh_interval=0.1,
     )
+    frames = FrameScheduler(
+        app,
+        max_fps=getattr(cfg, "ui_max_fps", DEFAULT_MAX_FPS) if cfg else DEFAULT_MAX_FPS,
+        idle_refresh=getattr(cfg, "ui_idle_refresh_s", DEFAULT_IDLE_REFRESH) if cfg else DEFAULT_IDLE_REFRESH,
+        clock=clock,
+    )
+    frames.watch(ages.advance)
+    state.deliveries.on_change = frames.request
+    app.after_render += lambda _: profiler.end_frame()
+
+    @main_kb.add("f7")
+    def _(event):
+        profiler.toggle_overlay()
+        event.app.invalidate()
+
+    @main_kb.add("f10")
+    def _(event):
+        if not profiler.enabled:
+            state.add_log("Render profiling is off; F7 starts it")
+            event.app.invalidate()
+            return
+        path = os.path.join(os.path.expanduser("~"), f"meshtui-profile-{int(time.time())}.json")
+        try:
+            profiler.dump(path)
+            state.add_log(f"Render profile written to {path}")
+        except OSError as e:
+            state.add_log(f"Render profile dump failed: {e}")
+        event.app.invalidate()
+
+    @main_kb.add("f9")
+    def _(event):
+        # toggle the diagnostics panel, returning to the previous tab
+        if bottom_tab["v"] == "Diag":
+            set_tab(bottom_tab.get("prev", "Log"))
+        else:
+            bottom_tab["prev"] = bottom_tab["v"]
+            set_tab("Diag")
+        event.app.invalidate()
 
     @main_kb.add("f6")
     def _(event):
@@ -123,13 +196,4 @@ def build_layout(state, actions, iface, bus, initial_theme: str | None = None, c
         app.style = theme.style
         app.invalidate()
 
-    def _persist():
-        if cfg:
-            cfg.last_tab = bottom_tab["v"]
-            try:
-                cfg.save()
-            except Exception:
-                pass
-
-    app.after_render += lambda _: _persist()
     return app
@@ -0,0 +1,91 @@
+# meshtui/ui_ptk/logview.py
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+from prompt_toolkit.data_structures import Point
+from prompt_toolkit.formatted_text import StyleAndTextTuples
+from prompt_toolkit.layout.controls import UIContent
+
+from meshtui.ui_ptk.controls import TailFollowControl, wrap_text
+
+
+def _line_count(text: str, width: int) -> int:
+    if text.isascii() and "\n" not in text:
+        return max(1, -(-len(text) // width))
+    return len(wrap_text(text, width))
+
+
+class LogControl(TailFollowControl):
+    """Log view that reads ``state.log`` (a RingBuffer) in place.
+
+    Wrapped line offsets are kept per entry as absolute prefix sums keyed by
+    the ring's sequence numbers: new entries are appended, evicted ones are
+    dropped from the front, and the whole table is only recomputed when the
+    width changes. ``get_line`` maps a screen row to its entry by bisection
+    and wraps just that entry.
+    """
+
+    def __init__(self, state):
+        super().__init__()
+        self.state = state
+        self._width = 0
+        self._seq0 = 0        # ring sequence number of _starts[0]
+        self._starts: List[int] = []
+        self._end = 0         # absolute line number after the last entry
+        self._key = None
+        self._content: Optional[UIContent] = None
+
+    def is_focusable(self) -> bool:
+        return False
+
+    def _sync(self, width: int) -> None:
+        log = self.state.log
+        first, stop = log.first_seq, log.appended
+        if width != self._width or self._seq0 + len(self._starts) < first:
+            self._width = width
+            self._seq0, self._starts, self._end = first, [], 0
+        elif self._seq0 < first:
+            gone = first - self._seq0
+            starts = self._starts
+            # keep a detached view on the same text while old lines fall off
+            shift = (starts[gone] if gone < len(starts) else self._end) - starts[0]
+            if not self._pinned:
+                self._cursor = max(0, self._cursor - shift)
+            del starts[:gone]
+            self._seq0 = first
+        starts, end = self._starts, self._end
+        for seq in range(self._seq0 + len(starts), stop):
+            starts.append(end)
+            end += _line_count(" " + log[seq - first], width)
+        self._end = end
+        self._total = end - starts[0] if starts else 0
+
+    def create_content(self, width: int, height: Optional[int]) -> UIContent:
+        state = self.state
+        key = (state.ver_log, width, self._cursor, self._pinned)
+        if self._content is not None and key == self._key:
+            return self._content
+
+        self._sync(width)
+        log = state.log
+        if not len(log):
+            self._key = key
+            self._content = UIContent(get_line=lambda i: [("", " Log empty.")], line_count=1, show_cursor=False)
+            return self._content
+
+        self._follow()
+        starts, base, first = self._starts, self._starts[0], log.first_seq
+        wrapped: Dict[int, List[str]] = {}
+
+        def get_line(i: int) -> StyleAndTextTuples:
+            k = bisect_right(starts, base + i) - 1
+            parts = wrapped.get(k)
+            if parts is None:
+                parts = wrapped[k] = wrap_text(" " + log[k], width)
+            j = base + i - starts[k]
+            return [("", parts[j])] if j < len(parts) else []
+
+        self._key = (state.ver_log, width, self._cursor, self._pinned)
+        self._content = UIContent(get_line=get_line, line_count=self._total,
+                                  cursor_position=Point(0, self._cursor), show_cursor=False)
+        return self._content
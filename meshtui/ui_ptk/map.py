@@ -1,23 +1,344 @@
 # meshtui/ui_ptk/map.py
-from prompt_toolkit.layout.controls import FormattedTextControl
+import math
+from typing import List, Optional, Tuple
+
+from prompt_toolkit.application import get_app
+from prompt_toolkit.formatted_text import StyleAndTextTuples
+from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.layout import Window
-from typing import Dict, Tuple
-
-def _project(lat: float, lon: float) -> Tuple[int, int]:
-    x = int((lon + 180) * 0.25)
-    y = int((90 - lat) * 0.25)
-    return x, y
-
-def build_map(state):
-    def _render() -> str:
-        width, height = 80, 24
-        canvas = [[" " for _ in range(width)] for _ in range(height)]
-        for node in state.ordered_nodes():
-            pos = node.get("pos")
-            if not pos:
-                continue
-            x, y = _project(pos.get("lat", 0.0), pos.get("lon", 0.0))
-            if 0 <= x < width and 0 <= y < height:
-                canvas[min(height - 1, y)][min(width - 1, x)] = "*"
-        return "\n".join("".join(r) for r in canvas)
-    return Window(content=FormattedTextControl(_render), wrap_lines=False, always_hide_cursor=True)
+from prompt_toolkit.layout.controls import UIControl, UIContent
+from prompt_toolkit.mouse_events import MouseEvent, MouseEventType
+
+from meshtui.core.geo import MAX_LAT, project, unproject
+from meshtui.core.basemap import LAND, Tile
+from meshtui.ui_ptk.braille import BITS, FLAT_BITS, BrailleCanvas
+
+TILE = 256               # world size in pixels at zoom 0 (slippy-map convention)
+CELL_W, CELL_H = 8, 16   # pixel footprint of one terminal cell (cells are ~1:2)
+MIN_ZOOM, MAX_ZOOM = 0.0, 18.0
+FIT_MARGIN = 0.85        # share of the viewport the fitted nodes may fill
+LAND_TEXTURE = (BITS[1][0], BITS[3][1])  # alternating stipple for land cells
+_STEPS = (90, 45, 30, 15, 10, 5, 2, 1, 0.5, 0.2, 0.1, 0.05, 0.02, 0.01, 0.005, 0.002, 0.001)
+
+
+def _nice_step(span_deg: float) -> float:
+    for step in _STEPS:
+        if span_deg / step >= 3:
+            return step
+    return _STEPS[-1]
+
+
+class Viewport:
+    """Center (in world coordinates) and zoom of the map.
+
+    ``version`` moves on every change so the map can key its canvas cache on
+    it. ``auto_fit`` stays on until the user pans or zooms, and while it is
+    on the view re-fits whenever node positions change.
+    """
+
+    def __init__(self, cx: float = 0.5, cy: float = 0.5, zoom: float = 1.0):
+        self.cx = cx
+        self.cy = cy
+        self.zoom = zoom
+        self.auto_fit = True
+        self.version = 0
+
+    def _px(self) -> float:
+        return TILE * 2.0 ** self.zoom
+
+    def rect(self, cols: int, rows: int) -> Tuple[float, float, float, float]:
+        px = self._px()
+        hw, hh = cols * CELL_W / 2 / px, rows * CELL_H / 2 / px
+        return self.cx - hw, self.cy - hh, self.cx + hw, self.cy + hh
+
+    def cell_to_world(self, col: float, row: float, cols: int, rows: int) -> Tuple[float, float]:
+        px = self._px()
+        return (self.cx + (col - cols / 2) * CELL_W / px,
+                self.cy + (row - rows / 2) * CELL_H / px)
+
+    def _set(self, cx: float, cy: float, zoom: float) -> None:
+        zoom = min(MAX_ZOOM, max(MIN_ZOOM, zoom))
+        cx, cy = min(1.0, max(0.0, cx)), min(1.0, max(0.0, cy))
+        if (cx, cy, zoom) != (self.cx, self.cy, self.zoom):
+            self.cx, self.cy, self.zoom = cx, cy, zoom
+            self.version += 1
+
+    def pan(self, dcols: float, drows: float) -> None:
+        px = self._px()
+        self.auto_fit = False
+        self._set(self.cx + dcols * CELL_W / px, self.cy + drows * CELL_H / px, self.zoom)
+
+    def zoom_by(self, step: float, anchor: Optional[Tuple[float, float]] = None) -> None:
+        """Zoom by ``step`` levels, keeping the world point ``anchor`` in place."""
+        self.auto_fit = False
+        zoom = min(MAX_ZOOM, max(MIN_ZOOM, self.zoom + step))
+        if anchor is None:
+            self._set(self.cx, self.cy, zoom)
+            return
+        k = 2.0 ** (self.zoom - zoom)
+        ax, ay = anchor
+        self._set(ax + (self.cx - ax) * k, ay + (self.cy - ay) * k, zoom)
+
+    def fit(self, bounds: Tuple[float, float, float, float], cols: int, rows: int,
+            max_zoom: float = 14.0) -> None:
+        x0, y0, x1, y1 = bounds
+        w = max(x1 - x0, 1e-9)
+        h = max(y1 - y0, 1e-9)
+        zx = math.log2(max(cols, 1) * CELL_W * FIT_MARGIN / (w * TILE))
+        zy = math.log2(max(rows, 1) * CELL_H * FIT_MARGIN / (h * TILE))
+        self._set((x0 + x1) / 2, (y0 + y1) / 2, min(zx, zy, max_zoom))
+
+
+class MapControl(UIControl):
+    """Node map over a Web Mercator viewport.
+
+    Only nodes inside the viewport are visited, via the state's grid index,
+    and the rasterized rows are cached until positions, the viewport or the
+    size change. Nodes are plotted as braille dots (2x4 per cell); a cell
+    holding several nodes shows their count instead. A dotted graticule
+    gives orientation. The last row is a status line (zoom, center, fit).
+
+    With a :class:`~meshtui.core.basemap.Basemap`, land is stippled and
+    coastlines drawn at dot resolution underneath the nodes. Those layers
+    only depend on the viewport, so they are cached apart from the nodes
+    and moving nodes never re-sample the tiles.
+
+    Keys (map focused): arrows pan, ``+``/``-`` zoom, ``f`` re-fits to all
+    nodes. Mouse: wheel zooms around the pointer, drag pans, click centers.
+    """
+
+    def __init__(self, state, basemap=None):
+        self.state = state
+        self.basemap = basemap
+        self._base_key = None
+        self._base: Optional[Tuple[bytearray, bytearray]] = None
+        self.viewport = Viewport()
+        self._fit_ver = -1
+        self._key = None
+        self._content: Optional[UIContent] = None
+        self._size = (0, 0)
+        self._drag: Optional[Tuple[int, int]] = None
+        self._dragged = False
+        self._kb = self._build_key_bindings()
+
+    def is_focusable(self) -> bool:
+        return True
+
+    def get_key_bindings(self) -> KeyBindings:
+        return self._kb
+
+    # -------- rendering --------
+    def create_content(self, width: int, height: Optional[int]) -> UIContent:
+        height = max(1, height or 1)
+        rows = max(1, height - 1)
+        idx = self.state.spatial
+        vp = self.viewport
+        if vp.auto_fit and (self._fit_ver != idx.version or self._size != (width, height)):
+            b = idx.bounds()
+            if b is not None:
+                vp.fit(b, width, rows)
+            self._fit_ver = idx.version
+        self._size = (width, height)
+
+        key = (idx.version, vp.version, vp.auto_fit, width, height)
+        if key != self._key or self._content is None:
+            lines = self._rasterize(width, rows) + [self._status_line(width)]
+            self._content = UIContent(get_line=lambda i: lines[i] if i < len(lines) else [],
+                                      line_count=len(lines), show_cursor=False)
+            self._key = key
+        return self._content
+
+    def _rasterize(self, cols: int, rows: int) -> List[StyleAndTextTuples]:
+        vp = self.viewport
+        x0, y0, x1, y1 = vp.rect(cols, rows)
+        canvas = BrailleCanvas(cols, rows)
+        self._graticule(canvas, canvas.layer("class:map.water"), x0, y0, x1, y1)
+        if self.basemap is not None:
+            land, coast = self._basemap_layers(cols, rows, x0, y0, x1, y1)
+            canvas.add_layer("class:map.land", land)
+            canvas.add_layer("class:map.land", coast)
+
+        nodes = canvas.layer("class:map.structure")
+        counts = canvas.counts
+        w, h = canvas.w, canvas.h
+        sx, sy = w / (x1 - x0), h / (y1 - y0)
+        bits = FLAT_BITS
+        ox, oy = x0 * sx, y0 * sy
+        for x, y in self.state.spatial.points(x0, y0, x1, y1):
+            px = int(x * sx - ox)
+            py = int(y * sy - oy)
+            if px < w and py < h:  # points() already excludes anything left/above
+                i = (py >> 2) * cols + (px >> 1)
+                nodes[i] |= bits[(py & 3) << 1 | (px & 1)]
+                if counts[i] < 255:
+                    counts[i] += 1
+        return canvas.render(cluster_style="class:map.land bold")
+
+    def _basemap_layers(self, cols: int, rows: int, x0: float, y0: float,
+                        x1: float, y1: float) -> Tuple[bytearray, bytearray]:
+        """Land stipple and coastline masks for the current viewport.
+
+        Tiles come from the level whose resolution is closest to the dot
+        grid, sampled nearest-neighbour. Columns are grouped by tile so each
+        tile is fetched once per row and uniform tiles cost nothing per dot.
+        """
+        key = (self.viewport.version, cols, rows)
+        if key == self._base_key and self._base is not None:
+            return self._base
+        bm = self.basemap
+        tb = bm.tile_bits
+        w, h = cols * 2, rows * 4
+        scale = w / (x1 - x0)  # dots per world unit
+        level = min(bm.max_level, max(0, round(math.log2(scale / tb))))
+        k = (tb << level) / scale  # tile bits per dot
+        bxs = [int(math.floor((x0 * scale + d + 0.5) * k)) for d in range(w)]
+        bys = [int(math.floor((y0 * scale + d + 0.5) * k)) for d in range(h)]
+
+        def _runs(cols_bx):
+            runs: List[Tuple[int, List[Tuple[int, int]]]] = []
+            for i, bx in enumerate(cols_bx):
+                tx = bx // tb
+                if not runs or runs[-1][0] != tx:
+                    runs.append((tx, []))
+                runs[-1][1].append((i, bx % tb))
+            return runs
+
+        tile = bm.tile
+        land = bytearray(cols * rows)
+        cell_runs = _runs(bxs[1::2])
+        for r in range(rows):
+            by = bys[r * 4 + 2]
+            ty, rb = by // tb, by % tb
+            base = r * cols
+            for tx, cells in cell_runs:
+                t = tile(level, tx, ty)
+                if t == LAND:
+                    for c, _b in cells:
+                        land[base + c] = LAND_TEXTURE[(c + r) & 1]
+                elif isinstance(t, Tile):
+                    bits = t.land[rb]
+                    if bits:
+                        for c, b in cells:
+                            if (bits >> b) & 1:
+                                land[base + c] = LAND_TEXTURE[(c + r) & 1]
+
+        coast = bytearray(cols * rows)
+        dot_runs = _runs(bxs)
+        flat = FLAT_BITS
+        for y in range(h):
+            by = bys[y]
+            ty, rb = by // tb, by % tb
+            base = (y >> 2) * cols
+            ybits = (y & 3) << 1
+            for tx, dots in dot_runs:
+                t = tile(level, tx, ty)
+                if not isinstance(t, Tile):
+                    continue
+                bits = t.coast[rb]
+                if bits:
+                    for x, b in dots:
+                        if (bits >> b) & 1:
+                            coast[base + (x >> 1)] |= flat[ybits | (x & 1)]
+        self._base_key = key
+        self._base = (land, coast)
+        return self._base
+
+    @staticmethod
+    def _graticule(canvas: BrailleCanvas, mask: bytearray, x0: float, y0: float, x1: float, y1: float) -> None:
+        """Dotted meridians/parallels at a round step giving a few lines per view."""
+        sx, sy = canvas.w / (x1 - x0), canvas.h / (y1 - y0)
+        lon_step = _nice_step((x1 - x0) * 360.0)
+        lon = math.ceil((x0 * 360.0 - 180.0) / lon_step) * lon_step
+        while lon <= x1 * 360.0 - 180.0:
+            if -180.0 <= lon <= 180.0:
+                canvas.vline(mask, int(((lon + 180.0) / 360.0 - x0) * sx), step=4)
+            lon += lon_step
+        lat_top = unproject(0.0, max(0.0, y0))[0]
+        lat_bottom = unproject(0.0, min(1.0, y1))[0]
+        lat_step = _nice_step(lat_top - lat_bottom)
+        lat = math.ceil(lat_bottom / lat_step) * lat_step
+        while lat <= lat_top:
+            if abs(lat) < MAX_LAT:
+                canvas.hline(mask, int((project(lat, 0.0)[1] - y0) * sy), step=4)
+            lat += lat_step
+
+    def _status_line(self, cols: int) -> StyleAndTextTuples:
+        vp = self.viewport
+        lat, lon = unproject(vp.cx, vp.cy)
+        mode = "fit" if vp.auto_fit else "f=fit"
+        text = f" z{vp.zoom:4.1f} {lat:8.4f},{lon:9.4f} {len(self.state.spatial)} pos  {mode}"
+        return [("class:text.muted", text[:cols])]
+
+    # -------- input --------
+    def _build_key_bindings(self) -> KeyBindings:
+        kb = KeyBindings()
+        vp = self.viewport
+
+        def _step() -> Tuple[float, float]:
+            cols, height = self._size
+            return max(1, cols // 4), max(1, (height - 1) // 4)
+
+        @kb.add("left")
+        def _(event):
+            vp.pan(-_step()[0], 0)
+
+        @kb.add("right")
+        def _(event):
+            vp.pan(_step()[0], 0)
+
+        @kb.add("up")
+        def _(event):
+            vp.pan(0, -_step()[1])
+
+        @kb.add("down")
+        def _(event):
+            vp.pan(0, _step()[1])
+
+        @kb.add("+")
+        @kb.add("=")
+        def _(event):
+            vp.zoom_by(1)
+
+        @kb.add("-")
+        def _(event):
+            vp.zoom_by(-1)
+
+        @kb.add("f")
+        def _(event):
+            vp.auto_fit = True
+            self._fit_ver = -1
+
+        return kb
+
+    def mouse_handler(self, mouse_event: MouseEvent):
+        cols, height = self._size
+        rows = max(1, height - 1)
+        pos = mouse_event.position
+        et = mouse_event.event_type
+        vp = self.viewport
+        if et in (MouseEventType.SCROLL_UP, MouseEventType.SCROLL_DOWN):
+            anchor = vp.cell_to_world(pos.x + 0.5, pos.y + 0.5, cols, rows)
+            vp.zoom_by(1 if et == MouseEventType.SCROLL_UP else -1, anchor)
+        elif et == MouseEventType.MOUSE_DOWN:
+            self._drag, self._dragged = (pos.x, pos.y), False
+            try:
+                get_app().layout.focus(self)
+            except ValueError:
+                pass
+        elif et == MouseEventType.MOUSE_MOVE and self._drag is not None:
+            dx, dy = pos.x - self._drag[0], pos.y - self._drag[1]
+            if dx or dy:
+                vp.pan(-dx, -dy)
+                self._drag, self._dragged = (pos.x, pos.y), True
+        elif et == MouseEventType.MOUSE_UP:
+            if not self._dragged and pos.y < rows:
+                vp.pan(pos.x + 0.5 - cols / 2, pos.y + 0.5 - rows / 2)
+            self._drag = None
+        else:
+            return NotImplemented
+        get_app().invalidate()
+        return None
+
+
+def build_map(state, basemap=None) -> Window:
+    return Window(content=MapControl(state, basemap), wrap_lines=False, always_hide_cursor=True)
@@ -0,0 +1,134 @@
+# meshtui/ui_ptk/nodelist.py
+from typing import Callable, List, Optional
+
+from prompt_toolkit.application import get_app
+from prompt_toolkit.data_structures import Point
+from prompt_toolkit.layout.controls import UIControl, UIContent
+from prompt_toolkit.mouse_events import MouseEvent, MouseEventType
+
+from meshtui.core.clock import CoarseClock
+from meshtui.ui_ptk.ages import AgeLabels
+
+HEADER_ROWS = 3  # public channel row, spacer, column header
+
+
+class NodeListControl(UIControl):
+    """Node list that only formats the rows the Window actually draws.
+
+    ``create_content`` hands prompt_toolkit a ``get_line`` over the current
+    sort order; the Window calls it for the visible rows only, so a frame
+    costs O(screen height) regardless of how many nodes are known. Clicks are
+    resolved from the mouse row instead of per-row handler closures.
+
+    Ages come from ``ages``, whose version only moves when a drawn label
+    crosses a bucket boundary; without one the control keeps a private
+    clock that it advances itself on every render.
+    """
+
+    def __init__(self, state, iface, on_pick: Optional[Callable[[int], None]] = None,
+                 ages: Optional[AgeLabels] = None):
+        self.state = state
+        self.iface = iface
+        self.on_pick = on_pick
+        self._own_clock = ages is None
+        self.ages = ages or AgeLabels(CoarseClock())
+        self._cursor = 0
+        self._rows: List = []
+        self._key = None
+        self._content: Optional[UIContent] = None
+
+    def is_focusable(self) -> bool:
+        return True
+
+    # -------- content --------
+    def _channel_name(self) -> str:
+        try:
+            primary_channel_index = getattr(self.iface.iface.radioConfig, "primary_channel", 0)
+            return dict(self.state.channels).get(primary_channel_index, f"CH{primary_channel_index}")
+        except Exception:
+            return "CH0"
+
+    def _line_count(self) -> int:
+        return HEADER_ROWS + len(self._rows) if self._rows else HEADER_ROWS
+
+    def create_content(self, width: int, height: Optional[int]) -> UIContent:
+        state = self.state
+        ages = self.ages
+        if self._own_clock:
+            ages.clock.tick()
+            ages.advance(ages.clock.now)
+        focused = self._has_focus()
+        key = (state.ver_nodes, state.ver_channels, state.dm_target, ages.version, self._cursor, focused, width)
+        if self._content is not None and key == self._key:
+            return self._content
+
+        self._rows = rows = getattr(state, "ordered_nodes", lambda: [])()
+        dm_target = state.dm_target
+        label = ages.label
+        public = f" [*] Public ({self._channel_name()})"
+        self._cursor = min(self._cursor, self._line_count() - 1)
+        cursor = self._cursor
+
+        def get_line(i: int):
+            if i >= HEADER_ROWS:
+                n = rows[i - HEADER_ROWS]
+                num = n.num
+                dm = "M" if n.dm else " "
+                age = label(num, n.last)
+                style = "class:list.item.selected" if dm_target == num else "class:row"
+                if focused and i == cursor:
+                    style = "class:list.item.focused"
+                return [(style, f"{i - HEADER_ROWS + 1:2d} {dm} {n.short or '?':<18.18} #{num:08x} {age:>4}")]
+            if i == 0:
+                style = "class:list.item.selected" if dm_target is None else "class:row"
+                if focused and cursor == 0:
+                    style = "class:list.item.focused"
+                return [(style, public)]
+            if i == 1:
+                return []
+            if rows:
+                return [("class:header", " # M SHORT NAME           NUM        AGE ")]
+            return [("class:text.muted", "No nodes found.")]
+
+        self._key = key
+        self._content = UIContent(get_line=get_line, line_count=self._line_count(),
+                                  cursor_position=Point(0, cursor), show_cursor=False)
+        return self._content
+
+    def _has_focus(self) -> bool:
+        try:
+            return get_app().layout.current_control is self
+        except Exception:
+            return False
+
+    # -------- navigation --------
+    def move_cursor_down(self) -> None:
+        self._cursor = min(self._cursor + 1, self._line_count() - 1)
+
+    def move_cursor_up(self) -> None:
+        self._cursor = max(0, self._cursor - 1)
+
+    def pick_row(self, row: int) -> bool:
+        if row == 0:
+            self.state.set_dm(None)
+            return True
+        idx = row - HEADER_ROWS
+        if 0 <= idx < len(self._rows):
+            num = self._rows[idx].num
+            if self.on_pick:
+                self.on_pick(num)
+            return True
+        return False
+
+    def pick_cursor(self) -> bool:
+        return self.pick_row(self._cursor)
+
+    def mouse_handler(self, mouse_event: MouseEvent):
+        if mouse_event.event_type != MouseEventType.MOUSE_UP:
+            return NotImplemented
+        row = mouse_event.position.y
+        if not self.pick_row(row):
+            return NotImplemented
+        self._cursor = row
+        get_app().invalidate()
+        return None
@@ -0,0 +1,184 @@
+# meshtui/ui_ptk/profiling.py
+import json
+import time
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+from prompt_toolkit.filters import Condition
+from prompt_toolkit.layout import ConditionalContainer, Float, Window
+from prompt_toolkit.layout.controls import FormattedTextControl, UIControl
+from prompt_toolkit.widgets import Frame
+
+from meshtui.core.metrics import RollingHistogram
+
+BUILD_EDGES_MS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50)
+FRAG_EDGES = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000)
+_BARS = " ▁▂▃▄▅▆▇█"
+
+
+class ViewStats:
+    __slots__ = ("name", "build", "frags", "hits", "misses", "_recent_hits", "_last", "_frame_frags", "_drawn")
+
+    def __init__(self, name: str, window: int):
+        self.name = name
+        self.build = RollingHistogram(BUILD_EDGES_MS, window)
+        self.frags = RollingHistogram(FRAG_EDGES, window)
+        self.hits = 0
+        self.misses = 0
+        self._recent_hits: deque = deque(maxlen=window)
+        self._last = None
+        self._frame_frags = 0
+        self._drawn = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        recent = self._recent_hits
+        return {
+            "build_ms": self.build.snapshot(),
+            "fragments": self.frags.snapshot(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (sum(recent) / len(recent)) if recent else 0.0,
+        }
+
+
+class ViewProfiler:
+    """Opt-in timing of the UI controls, one :class:`ViewStats` per view.
+
+    While enabled, each registered control's ``create_content`` is shadowed
+    by an instance attribute that times the call, and the returned content's
+    ``get_line`` counts the fragments the Window actually draws. Getting the
+    same content object back as last time counts as a cache hit, which is
+    how every control here signals one. Disabling removes the shadowing, so
+    a profiler that was never turned on costs nothing per frame.
+    """
+
+    def __init__(self, window: int = 256):
+        self.window = window
+        self.enabled = False
+        self.pinned = False   # on for the whole session (``ui_profile``)
+        self.visible = False
+        self._views: Dict[str, Tuple[UIControl, ViewStats]] = {}
+
+    def register(self, name: str, control: UIControl) -> None:
+        st = ViewStats(name, self.window)
+        self._views[name] = (control, st)
+        if self.enabled:
+            self._patch(control, st)
+
+    # -------- switching --------
+    def enable(self, pin: bool = False) -> None:
+        self.pinned = self.pinned or pin
+        if not self.enabled:
+            self.enabled = True
+            for control, st in self._views.values():
+                self._patch(control, st)
+
+    def disable(self) -> None:
+        if self.enabled:
+            self.enabled = False
+            for control, _st in self._views.values():
+                control.__dict__.pop("create_content", None)
+
+    def toggle_overlay(self) -> None:
+        """Show/hide the overlay; profiling runs while it is shown, or always if pinned."""
+        self.visible = not self.visible
+        if self.visible:
+            self.enable()
+        elif not self.pinned:
+            self.disable()
+
+    def reset(self) -> None:
+        for name, (control, _st) in list(self._views.items()):
+            st = ViewStats(name, self.window)
+            self._views[name] = (control, st)
+            if self.enabled:
+                self._patch(control, st)
+
+    def _patch(self, control: UIControl, st: ViewStats) -> None:
+        inner = type(control).create_content.__get__(control)
+        perf = time.perf_counter
+
+        def create_content(width, height):
+            t0 = perf()
+            content = inner(width, height)
+            st.build.add((perf() - t0) * 1000.0)
+            hit = content is st._last
+            if hit:
+                st.hits += 1
+            else:
+                st.misses += 1
+            st._recent_hits.append(hit)
+            st._last = content
+            st._drawn = True
+            if not getattr(content, "_profiled", False):
+                get_line = content.get_line
+
+                def counted(i):
+                    frags = get_line(i)
+                    st._frame_frags += len(frags)
+                    return frags
+
+                content.get_line = counted
+                content._profiled = True
+            return content
+
+        control.create_content = create_content
+
+    def end_frame(self) -> None:
+        """Fold this frame's fragment counts into the histograms (after_render)."""
+        if not self.enabled:
+            return
+        for _control, st in self._views.values():
+            if st._drawn:
+                st.frags.add(st._frame_frags)
+                st._frame_frags = 0
+                st._drawn = False
+
+    # -------- output --------
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "build_edges_ms": list(BUILD_EDGES_MS),
+            "fragment_edges": list(FRAG_EDGES),
+            "views": {name: st.snapshot() for name, (_c, st) in self._views.items()},
+        }
+
+    def dump(self, path: str) -> None:
+        """Write :meth:`snapshot` as JSON to ``path``."""
+        snap = self.snapshot()
+        snap["ts"] = time.time()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snap, f, indent=2)
+
+    def _fragments(self) -> List[Tuple[str, str]]:
+        out: List[Tuple[str, str]] = [
+            ("class:header", " VIEW      CALLS  p50 ms  p95 ms  max ms  HIT%  FRAGS  build histogram\n"),
+        ]
+        for name, (_c, st) in self._views.items():
+            b = st.build.snapshot()
+            fr = st.frags.snapshot()
+            recent = st._recent_hits
+            rate = (sum(recent) / len(recent)) if recent else 0.0
+            top = max(b["buckets"]) or 1
+            bars = "".join(_BARS[(n * (len(_BARS) - 1) + top - 1) // top] for n in b["buckets"])
+            out.append(("", f" {name:<8.8} {b['count']:>6} {b['p50']:7.2f} {b['p95']:7.2f} {b['max']:7.2f}"
+                            f"  {rate * 100:3.0f}% {fr['p50']:>6.0f}  {bars}\n"))
+        out.append(("class:text.muted", f" buckets ≤{', '.join(f'{e:g}' for e in BUILD_EDGES_MS)} ms, >\n"))
+        return out
+
+    def overlay(self) -> Float:
+        window = Window(
+            content=FormattedTextControl(self._fragments),
+            wrap_lines=False,
+            always_hide_cursor=True,
+            dont_extend_width=True,
+            dont_extend_height=True,
+        )
+        return Float(
+            content=ConditionalContainer(
+                Frame(window, title="Render profile", style="class:frame"),
+                filter=Condition(lambda: self.visible),
+            ),
+            top=1,
+            right=1,
+            z_index=200,
+        )
@@ -6,7 +6,7 @@ async def choose_dm_node(app, state):
     if not nodes:
         await message_dialog(title="No Nodes", text="No nodes available.").run_async()
         return
-    values = [(n["num"], f"{n['short']}  #{n['num']:x}") for n in nodes]
+    values = [(n.num, f"{n.short}  #{n.num:x}") for n in nodes]
     sel = await radiolist_dialog(title="Select DM Node", text="Choose a node:", values=values).run_async()
     if sel is None:
         return
@@ -1,5 +1,5 @@
 # meshtui/ui_ptk/status.py
-from prompt_toolkit.layout.controls import FormattedTextControl
+from meshtui.ui_ptk.controls import CachedFormattedTextControl
 from prompt_toolkit.layout import Window
 
 def status_view(state, theme_name_provider):
@@ -8,4 +8,7 @@ def status_view(state, theme_name_provider):
         ch = "CH: " + (",".join(str(i) for i in sorted(state.active_channels)) if state.active_channels else "-")
         tn = f"Theme: {theme_name_provider()}"
         return f"{dm}   {ch}   {tn}"
-    return Window(content=FormattedTextControl(_line), height=1, always_hide_cursor=True, style="class:statusbar")
\ No newline at end of file
+    def _key():
+        return (state.dm_target, state.ver_channels, theme_name_provider())
+    return Window(content=CachedFormattedTextControl(_line, cache_key=_key), height=1, always_hide_cursor=True,
+                  style="class:statusbar")
\ No newline at end of file
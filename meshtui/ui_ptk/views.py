@@ -1,5 +1,4 @@
 # meshtui/ui_ptk/views.py
-import time
 from typing import Iterable, List, Tuple, Callable, Any, Optional
 from prompt_toolkit.formatted_text import to_formatted_text, StyleAndTextTuples
 from prompt_toolkit.layout.controls import FormattedTextControl
@@ -11,8 +10,11 @@ from prompt_toolkit.layout.margins import ScrollbarMargin
 from prompt_toolkit.mouse_events import MouseEventType, MouseEvent
 from meshtui.themes import ThemeManager
 from meshtui.ui_ptk import dialogs
-from meshtui.ui_ptk.controls import FlatButtonWindow
-from meshtui.model import STATUS_SYMBOL, MsgStatus
+from meshtui.ui_ptk.controls import FlatButtonWindow, CachedFormattedTextControl
+from meshtui.ui_ptk.chat import ChatControl
+from meshtui.ui_ptk.logview import LogControl
+from meshtui.ui_ptk.ages import format_age  # noqa: F401  (re-exported)
+from meshtui.ui_ptk.nodelist import NodeListControl
 
 # -------- Helpers ---------------------------------------------------------
 
@@ -41,116 +43,77 @@ def _safe_fragments(items: Iterable[Any]) -> StyleAndTextTuples:
             out.append(("", "" if it is None else str(it)))
     return to_formatted_text(out)
 
-class SafeFormattedTextControl(FormattedTextControl):
+class SafeFormattedTextControl(CachedFormattedTextControl):
     def __init__(self, text: Callable[[], Iterable[Any]], **kwargs):
         super().__init__(text=lambda: _safe_fragments(text()), **kwargs)
 
-# -------- Formatting ------------------------------------------------------
-
-def format_age(seconds: float) -> str:
-    seconds = int(seconds)
-    if seconds < 60: return f"{seconds}s"
-    if seconds < 3600: return f"{seconds // 60}m"
-    if seconds < 86400: return f"{seconds // 3600}h"
-    if seconds < 604800: return f"{seconds // 86400}d"
-    return f"{seconds // 604800}w"
-
 # -------- Views -----------------------------------------------------------
 
-def combined_list_view(state, iface, on_pick: Optional[Callable[[int], None]] = None) -> Window:
-    def _fragments():
-        frags: List[Tuple] = []
-
-        def _clear_dm_handler(mouse_event: MouseEvent):
-            if mouse_event.event_type == MouseEventType.MOUSE_UP:
-                state.set_dm(None)
-                get_app().invalidate()
-                return None  # handled
-            return NotImplemented
-
-        is_broadcast_selected = state.dm_target is None
-        row_style = "class:list.item.selected" if is_broadcast_selected else "class:row"
-
-        try:
-            primary_channel_index = getattr(iface.iface.radioConfig, "primary_channel", 0)
-            channel_name = dict(state.channels).get(primary_channel_index, f"CH{primary_channel_index}")
-        except Exception:
-            channel_name = "CH0"
-
-        frags.append(_as_fragment(row_style, f" [*] Public ({channel_name})\n", _clear_dm_handler))
-        frags.append(_as_fragment("", "\n"))
-
-        nodes = getattr(state, "ordered_nodes", lambda: [])()
-        if not nodes:
-            frags.append(_as_fragment("class:text.muted", "No nodes found."))
-        else:
-            frags.append(_as_fragment("class:header", " # M SHORT NAME           NUM        AGE \n"))
-            for i, n in enumerate(nodes, 1):
-                def _node_handler(mouse_event: MouseEvent, _num=n.get("num", 0)):
-                    if mouse_event.event_type == MouseEventType.MOUSE_UP:
-                        if on_pick: on_pick(_num)
-                        get_app().invalidate()
-                        return None  # handled
-                    return NotImplemented
-
-                short = n.get("short", "?")
-                num = n.get("num", 0)
-                dm = "M" if n.get("dm") else " "
-                age = format_age(time.time() - n.get("last", 0))
-                style = "class:list.item.selected" if state.dm_target == num else "class:row"
-                frags.append(_as_fragment(style, f"{i:2d} {dm} {short:<18.18} #{num:08x} {age:>4}\n", _node_handler))
-
-        # Trim trailing newline to avoid extra blank line draw issues.
-        if frags:
-            last = frags[-1]
-            if isinstance(last, tuple) and len(last) >= 2 and isinstance(last[1], str) and last[1].endswith("\n"):
-                frags[-1] = (last[0], last[1][:-1]) if len(last) == 2 else (last[0], last[1][:-1], last[2])
-
-        return frags
-
+def combined_list_view(state, iface, on_pick: Optional[Callable[[int], None]] = None,
+                       ages=None) -> Window:
     return Window(
-        content=SafeFormattedTextControl(text=_fragments, focusable=True),
+        content=NodeListControl(state, iface, on_pick=on_pick, ages=ages),
         wrap_lines=False,
         right_margins=[ScrollbarMargin(display_arrows=True)],
     )
 
 def log_view(state) -> Window:
-    def _text():
-        return [("", f" {line}\n") for line in state.log] if state.log else [("", " Log empty.")]
     return Window(
-        content=SafeFormattedTextControl(_text),
-        wrap_lines=True,
+        content=LogControl(state),
+        wrap_lines=False,
         always_hide_cursor=True,
         height=Dimension(weight=1, min=5),
         right_margins=[ScrollbarMargin(display_arrows=True)],
     )
 
 def chat_view(state) -> Window:
+    return Window(
+        content=ChatControl(state),
+        wrap_lines=False,
+        always_hide_cursor=True,
+        height=Dimension(weight=3, min=8),
+        right_margins=[ScrollbarMargin(display_arrows=True)],
+    )
+
+def diagnostics_view(bus) -> Window:
+    def _ms(v: float) -> str:
+        return f"{v * 1000:7.2f}"
+
     def _frags():
-        to = state.dm_target if state.dm_target is not None else -1
-        msgs = state.chats.get(to, [])
-        if not msgs:
-            return [("", " (No messages)\n")]
-        out: List[Tuple] = []
-        for m in msgs:
-            sym = STATUS_SYMBOL.get(m.status, "?")
-            style = {
-                MsgStatus.PENDING: "class:msg.pending",
-                MsgStatus.SENT: "class:msg.sent",
-                MsgStatus.RETRYING: "class:msg.retry",
-                MsgStatus.ACKED: "class:msg.acked",
-                MsgStatus.FAILED: "class:msg.failed",
-            }.get(m.status, "")
-            out.append((style, f"{sym} "))
-            out.append(("class:msg.body", m.text))
+        snap = bus.snapshot() if hasattr(bus, "snapshot") else {}
+        if not snap:
+            return [("class:text.muted", " No diagnostics available.")]
+        out: List[Tuple] = [
+            ("class:header", " Bus\n"),
+            ("", f" depth {snap.get('depth', 0):>6}   high-water {snap.get('high_water', 0):>6}\n"),
+            ("", f" events {snap.get('events', 0):>7}   batches {snap.get('batches', 0):>7}\n"),
+            ("", f" latency ms  p50 {_ms(snap.get('latency_p50', 0.0))}  p95 {_ms(snap.get('latency_p95', 0.0))}"
+                 f"  max {_ms(snap.get('latency_max', 0.0))}\n"),
+            ("", f" reducer ms  p50 {_ms(snap.get('reducer_p50', 0.0))}  p95 {_ms(snap.get('reducer_p95', 0.0))}\n"),
+            ("", "\n"),
+        ]
+        subs = snap.get("subscribers", {})
+        if len(subs) > 1:
+            out.append(("class:header", " SUBSCRIBER       DEPTH     HW   DROP   COAL\n"))
+            for name, st in subs.items():
+                out.append(("", f" {name:<15.15} {st['depth']:>6} {st['high_water']:>6}"
+                                f" {st['dropped']:>6} {st['coalesced']:>6}\n"))
             out.append(("", "\n"))
+        out.append(("class:header", " TYPE             COUNT  LAT avg  RED avg  COAL  DROP\n"))
+        coalesced = snap.get("coalesced", {})
+        dropped = snap.get("dropped", {})
+        types = snap.get("types", {})
+        for name in sorted(set(types) | set(coalesced) | set(dropped)):
+            t = types.get(name, {})
+            out.append(("", f" {name:<15.15} {t.get('count', 0):>6} {_ms(t.get('latency_avg', 0.0))}"
+                            f"  {_ms(t.get('reducer_avg', 0.0))} {coalesced.get(name, 0):>5} {dropped.get(name, 0):>5}\n"))
         return out
+
     return Window(
         content=SafeFormattedTextControl(_frags),
-        wrap_lines=True,
+        wrap_lines=False,
         always_hide_cursor=True,
-        height=Dimension(weight=3, min=8),
-        right_margins=[ScrollbarMargin(display_arrows=True)],
+        height=Dimension(weight=1, min=5),
     )
 
 def settings_view(state, iface, cfg) -> Box:
@@ -180,7 +143,7 @@ def settings_view(state, iface, cfg) -> Box:
             cfg.mqtt_enabled = bool(mqtt_on.checked)
             cfg.mqtt_tls = bool(mqtt_tls.checked)
             cfg.theme = theme_box.text.strip() or None
-            cfg.save()
+            cfg.request_save("last_port", "mqtt_host", "mqtt_port", "mqtt_enabled", "mqtt_tls", "theme")
             state.add_log("[settings] saved")
         except Exception as e:
             state.add_log(f"[settings] save error: {e}")
@@ -189,8 +152,7 @@ def settings_view(state, iface, cfg) -> Box:
         if direction > 0:
             tm.cycle_next()
         else:
-            for _ in range(len(tm.names()) - 1):
-                tm.cycle_next()
+            tm.cycle_prev()
         theme_box.text = tm.name
         app = get_app()
         app.style = tm.style
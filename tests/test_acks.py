@@ -0,0 +1,34 @@
+import asyncio
+import threading
+
+from meshtui.core.ack_registry import AckRegistry
+from meshtui.core.delivery import DeliveryTracker
+from meshtui.core.state import AppState
+from meshtui.core.timerwheel import TimerWheel
+from meshtui.model import MsgStatus
+
+
+def test_late_ack_after_expiry_marks_acked():
+    async def run():
+        state = AppState()
+        registry = AckRegistry()
+        tracker = DeliveryTracker(state, registry, wheel=TimerWheel(now=0.0))
+        tracker.attach(asyncio.get_running_loop())
+        try:
+            msg = state.add_outgoing(5, "hello")
+            state.bind_delivery_id(msg, 42)
+            registry.register(42)
+            tracker.track(42, timeout=10.0, now=0.0)
+            tracker.advance(11.0)
+            assert msg.status is MsgStatus.FAILED
+
+            # the radio's ACK shows up late, on its own thread
+            t = threading.Thread(target=registry.set_result, args=(42, "ACK", 5))
+            t.start()
+            t.join()
+            await asyncio.sleep(0)
+            assert msg.status is MsgStatus.ACKED
+        finally:
+            await tracker.aclose()
+
+    asyncio.run(run())
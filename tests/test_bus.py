@@ -0,0 +1,47 @@
+import asyncio
+
+from meshtui.core import events
+from meshtui.core.bus import EventQueue
+
+
+def _drain(q):
+    out = []
+    while True:
+        try:
+            out.append(q.get_nowait())
+        except asyncio.QueueEmpty:
+            return out
+
+
+def test_capacity_drops_droppable_before_keep():
+    q = EventQueue(capacity=3)
+    q.put(events.RxText(src=1, text="keep me"))
+    for i in range(3):
+        q.put(events.Log(text=f"l{i}"))
+
+    assert len(q) == 3
+    assert _drain(q) == [events.RxText(src=1, text="keep me"), events.Log(text="l1"), events.Log(text="l2")]
+    st = q.stats()
+    assert st["overflowed"] == 1 and st["overflowed_keep"] == 0
+
+
+def test_capacity_drops_keep_as_last_resort():
+    q = EventQueue(capacity=2)
+    for i in range(3):
+        q.put(events.RxText(src=i, text="x"))
+
+    assert [ev.src for ev in _drain(q)] == [1, 2]
+    assert q.stats()["overflowed_keep"] == 1
+    assert q.stats()["dropped"] == {"RxText": 1}
+
+
+def test_capacity_keeps_coalesce_and_lanes_consistent():
+    q = EventQueue(capacity=4)
+    for i in range(6):
+        q.put(events.Beacon(num=i % 3, short="n", ts=float(i)))
+        q.put(events.Log(text=f"l{i}"))
+    got = _drain(q)
+
+    assert len(got) == 4 and len(q) == 0
+    q.put(events.Beacon(num=0, short="n", ts=9.0))
+    assert _drain(q) == [events.Beacon(num=0, short="n", ts=9.0)]
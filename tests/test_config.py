@@ -0,0 +1,19 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from meshtui.core.config import write_json_atomic
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="POSIX permissions")
+def test_atomic_write_keeps_file_mode(tmp_path):
+    path = tmp_path / "meshtui.json"
+    path.write_text("{}")
+    os.chmod(path, 0o644)
+
+    write_json_atomic(str(path), {"theme": "dark"})
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert path.read_text().strip().startswith("{")
@@ -0,0 +1,32 @@
+from meshtui.core import events
+from meshtui.core.journal import JournalWriter, encode, iter_journal
+
+
+def _write(path, evs):
+    w = JournalWriter(str(path))
+    for ev in evs:
+        w.append(ev, 1.0)
+    w.close()
+
+
+def test_append_after_torn_record_replays(tmp_path):
+    path = tmp_path / "j.bin"
+    _write(path, [events.Log(text="before")])
+    rec = encode(events.RxText(src=1, text="torn"), 2.0)
+    with open(path, "ab") as f:
+        f.write(rec[: len(rec) // 2])
+
+    _write(path, [events.Log(text="after")])
+
+    assert [ev for _ts, ev in iter_journal(str(path))] == [events.Log(text="before"), events.Log(text="after")]
+
+
+def test_replay_stops_at_garbage(tmp_path):
+    path = tmp_path / "j.bin"
+    _write(path, [events.Log(text="ok")])
+    rec = bytearray(encode(events.Log(text="x" * 8), 2.0))
+    rec[-8:] = b"\xff" * 8
+    with open(path, "ab") as f:
+        f.write(rec)
+
+    assert [ev for _ts, ev in iter_journal(str(path))] == [events.Log(text="ok")]
@@ -0,0 +1,38 @@
+import asyncio
+
+from meshtui.core.bus import Bus
+from meshtui.core.reducer import apply_event
+from meshtui.core.simulator import Scenario, SimulatedIO, _FakeInterface
+from meshtui.core.state import AppState
+
+
+def test_generated_positions_move_nodes():
+    async def run():
+        state, bus = AppState(), Bus()
+        sim = SimulatedIO(bus, asyncio.get_running_loop(), state, None, Scenario(nodes=3, seed=1))
+        sim.iface = _FakeInterface(sim, sim.scenario, sim._rng)
+        sim._push_nodes_snapshot()
+        await asyncio.sleep(0)
+        for ev in _drain(bus):
+            apply_event(state, ev)
+        before = {num: (n.pos.lat, n.pos.lon) for num, n in state.nodes.items()}
+
+        for _ in range(20):
+            sim._gen_position()
+        await asyncio.sleep(0)
+        for ev in _drain(bus):
+            apply_event(state, ev)
+        after = {num: (n.pos.lat, n.pos.lon) for num, n in state.nodes.items()}
+
+        assert before.keys() == after.keys()
+        assert any(before[k] != after[k] for k in before)
+
+    asyncio.run(run())
+
+
+def _drain(bus):
+    q = bus.primary.queue
+    out = []
+    while len(q):
+        out.append(q.get_nowait())
+    return out